@@ -8,9 +8,6 @@ import sys
 import json
 from datetime import datetime
 
-# 添加当前目录到Python路径
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 from x.config import Config
 from x.twitter_monitor import TwitterMonitor
 from x.xtracker_client import XTrackerClient
@@ -201,7 +198,7 @@ class ServiceTester:
         # 检查Python包
         try:
             import requests
-            import schedule
+            import aiohttp
             print("✅ 所有依赖包已安装")
         except ImportError as e:
             print(f"❌ 缺少依赖包: {e}")
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+状态持久化测试 - 已通知推文ID、统计数据记录以及监控服务的首次运行处理
+"""
+
+import asyncio
+import json
+import os
+import queue
+import shelve
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from x.config import load_settings
+from x.main import XMonitorService
+from x.state import SeenTweetIds, state_lock, fcntl
+from x.xtracker_client import UserStats
+
+
+def _tweets(*tweet_ids):
+    """按页面顺序（最新的在前）构造推文列表"""
+    return [{'id': tweet_id, 'content': f"tweet {tweet_id}"} for tweet_id in tweet_ids]
+
+
+class SeenTweetIdsTest(unittest.TestCase):
+    """SeenTweetIds 的淘汰、加载和容错"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'seen_ids.json')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_evicts_oldest_id(self):
+        seen = SeenTweetIds(self.path, maxlen=3)
+        for tweet_id in ('1', '2', '3', '4'):
+            seen.add('alice', tweet_id)
+
+        self.assertNotIn(('alice', '1'), seen)
+        self.assertIn(('alice', '4'), seen)
+        self.assertNotIn(('bob', '4'), seen)
+
+    def test_re_adding_keeps_id_from_eviction(self):
+        seen = SeenTweetIds(self.path, maxlen=3)
+        seen.add('alice', 'pinned')
+        for tweet_id in ('1', '2', '3', '4'):
+            seen.add('alice', 'pinned')
+            seen.add('alice', tweet_id)
+
+        self.assertIn(('alice', 'pinned'), seen)
+        self.assertNotIn(('alice', '2'), seen)
+
+    def test_save_and_load_round_trip(self):
+        seen = SeenTweetIds(self.path)
+        seen.add('alice', '1')
+        seen.add('alice', '2')
+        seen.save()
+
+        loaded = SeenTweetIds(self.path)
+        loaded.load()
+        self.assertIn(('alice', '1'), loaded)
+        self.assertIn(('alice', '2'), loaded)
+        self.assertTrue(loaded.has_history('alice'))
+        self.assertFalse(loaded.has_history('bob'))
+
+    def test_load_replaces_memory_with_file(self):
+        # 其他实例已淘汰的ID不能被本实例重新合并回来
+        ours = SeenTweetIds(self.path, maxlen=2)
+        theirs = SeenTweetIds(self.path, maxlen=2)
+        ours.add('alice', '1')
+        ours.save()
+
+        theirs.load()
+        theirs.add('alice', '2')
+        theirs.add('alice', '3')
+        theirs.save()
+
+        ours.load()
+        self.assertNotIn(('alice', '1'), ours)
+        self.assertIn(('alice', '3'), ours)
+
+        # 重新加载后没有未保存的修改
+        ours.save()
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'alice': ['2', '3']})
+
+    def test_corrupt_file_starts_empty(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{not json')
+
+        seen = SeenTweetIds(self.path)
+        seen.add('alice', 'stale')
+        seen.load()
+        self.assertFalse(seen.has_history('alice'))
+
+        seen.add('alice', '1')
+        seen.save()
+        with open(self.path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'alice': ['1']})
+
+    def test_missing_file_starts_empty(self):
+        seen = SeenTweetIds(self.path)
+        seen.load()
+        self.assertFalse(seen.has_history('alice'))
+        seen.save()
+        self.assertFalse(os.path.exists(self.path))
+
+
+@unittest.skipIf(fcntl is None, "fcntl is not available on this platform")
+class StateLockTest(unittest.TestCase):
+    """state_lock 在进程之间互斥"""
+
+    PROBE = (
+        "import fcntl, sys\n"
+        "with open(sys.argv[1], 'a') as f:\n"
+        "    try:\n"
+        "        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)\n"
+        "    except BlockingIOError:\n"
+        "        sys.exit(1)\n"
+    )
+
+    def _locked_elsewhere(self, lock_path):
+        """在另一个进程中尝试非阻塞加锁，加锁失败说明锁被占用"""
+        return subprocess.run([sys.executable, '-c', self.PROBE, lock_path]).returncode == 1
+
+    def test_lock_is_exclusive_and_released(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'state', 'seen_ids.json')
+            lock_path = f"{path}.lock"
+
+            with state_lock(path):
+                self.assertTrue(os.path.exists(lock_path))
+                self.assertTrue(self._locked_elsewhere(lock_path))
+
+            self.assertFalse(self._locked_elsewhere(lock_path))
+
+
+class UserStatsShelveTest(unittest.TestCase):
+    """UserStats 经 shelve 持久化"""
+
+    def test_round_trip_through_shelve(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'last_stats')
+            stats = UserStats.from_stats({'followers': 10, 'following': 2, 'tweets': 3})
+
+            with shelve.open(path) as db:
+                db['alice'] = stats
+            with shelve.open(path) as db:
+                self.assertEqual(db['alice'], stats)
+                self.assertEqual(db['alice'].followers, 10)
+
+
+class MonitorStateTest(unittest.TestCase):
+    """监控服务对已通知状态的处理"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.env = mock.patch.dict(os.environ, {
+            'DINGTALK_ACCESS_TOKEN': 'token',
+            'TWITTER_USERS': 'alice',
+            'STATE_DIR': os.path.join(self.temp_dir.name, 'state'),
+            'LOG_DIR': os.path.join(self.temp_dir.name, 'logs'),
+            'XTRACKER_API_URL': 'https://xtracker.example/api?stats=true',
+        })
+        self.env.start()
+        load_settings.cache_clear()
+
+        self.page = []
+        self.sent = []
+        self.full = False
+
+    def tearDown(self):
+        self.env.stop()
+        load_settings.cache_clear()
+        self.temp_dir.cleanup()
+
+    def _service(self):
+        service = XMonitorService()
+
+        async def batch(session, usernames, limit=5, timeout=30):
+            return {'alice': list(self.page)}
+
+        def enqueue(tweet_data, include_stats=True):
+            if self.full:
+                raise queue.Full
+            self.sent.append(tweet_data['tweet']['id'])
+
+        service.twitter_monitor.aget_latest_tweets_batch = batch
+        service.dingtalk_client.enqueue_tweet_notification = enqueue
+        return service
+
+    def _check(self, service):
+        asyncio.run(service._monitor_tweets_async(None))
+
+    def test_first_run_pushes_newest_only(self):
+        service = self._service()
+        self.page = _tweets('3', '2', '1')
+        self._check(service)
+        self.assertEqual(self.sent, ['3'])
+
+        # 重启后不再推送已记录的推文，只推送新推文
+        service = self._service()
+        self.page = _tweets('4', '3', '2')
+        self._check(service)
+        self.assertEqual(self.sent, ['3', '4'])
+
+    def test_first_run_push_all(self):
+        with mock.patch.dict(os.environ, {'ON_FIRST_RUN_PUSH_ALL': 'true'}):
+            load_settings.cache_clear()
+            service = self._service()
+        self.page = _tweets('3', '2', '1')
+        self._check(service)
+        self.assertEqual(self.sent, ['1', '2', '3'])
+
+    def test_unqueued_tweets_stay_unseen(self):
+        service = self._service()
+        self.page = _tweets('1')
+        self._check(service)
+
+        self.page = _tweets('3', '2', '1')
+        self.full = True
+        self._check(service)
+        self.assertEqual(self.sent, ['1'])
+
+        self.full = False
+        self._check(service)
+        self.assertEqual(self.sent, ['1', '2', '3'])
+
+    def test_stats_persist_and_change_detection(self):
+        service = self._service()
+        updates = []
+        followers = {'value': 100}
+
+        async def get_stats(session, username):
+            return {'username': username, 'followers': followers['value'], 'following': 1, 'tweets': 1}
+
+        service.xtracker_client.aget_user_stats = get_stats
+        service.dingtalk_client.enqueue_stats_update = lambda username, stats: updates.append(stats['followers'])
+
+        asyncio.run(service._monitor_xtracker_stats_async(None))
+        asyncio.run(service._monitor_xtracker_stats_async(None))
+        self.assertEqual(updates, [100])
+
+        # 新的服务实例从shelve读取上次记录
+        service2 = self._service()
+        service2.xtracker_client.aget_user_stats = get_stats
+        service2.dingtalk_client.enqueue_stats_update = lambda username, stats: updates.append(stats['followers'])
+        followers['value'] = 101
+        asyncio.run(service2._monitor_xtracker_stats_async(None))
+        self.assertEqual(updates, [100, 101])
+
+
+if __name__ == "__main__":
+    unittest.main()
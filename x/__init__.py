@@ -9,14 +9,16 @@ __author__ = "Paul Zhu"
 __email__ = "isanwenyu@163.com"
 __description__ = "Twitter/X monitoring and DingTalk notification service"
 
-from .config import load_settings
+from .config import Config, load_settings
 from .twitter_monitor import TwitterMonitor
-from .dingtalk import DingTalkClient
+from .dingtalk import DingTalkClient, AsyncDingTalkClient
 from .xtracker_client import XTrackerClient
 
 __all__ = [
+    "Config",
     "load_settings",
     "TwitterMonitor", 
     "DingTalkClient",
+    "AsyncDingTalkClient",
     "XTrackerClient"
 ]
\ No newline at end of file
@@ -2,35 +2,54 @@
 Configuration management module
 """
 
+import functools
 import os
 import sys
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import Any, List, Mapping, Optional
 from dotenv import load_dotenv
 import pytz
 
 
-def load_settings() -> Dict[str, Any]:
+REQUIRED_KEYS = (
+    ('dingtalk', 'access_token'),
+    ('twitter', 'username'),
+    ('twitter', 'poll_seconds'),
+    ('nitter', 'base_urls'),
+    ('xtracker', 'url'),
+    ('paths', 'state_dir'),
+    ('paths', 'log_dir'),
+)
+
+
+@functools.lru_cache(maxsize=1)
+def load_settings() -> Mapping[str, Any]:
     """
     Load and validate configuration settings from environment variables.
     
+    The result is cached for the lifetime of the process and shared by all
+    callers, so it is read-only; call load_settings.cache_clear() to pick up
+    changed environment variables.
+    
     Returns:
-        Dict[str, Any]: Configuration dictionary with validated settings
+        Mapping[str, Any]: Read-only configuration mapping with validated settings
     """
     # Load .env file if it exists
     load_dotenv()
+    env = os.environ
     
     # Required settings
-    dingtalk_token = os.getenv('DINGTALK_ACCESS_TOKEN')
+    dingtalk_token = env.get('DINGTALK_ACCESS_TOKEN')
     if not dingtalk_token:
         raise ValueError("DINGTALK_ACCESS_TOKEN is required")
     
     # Parse Nitter URLs
-    nitter_urls_str = os.getenv('NITTER_BASE_URLS', 'https://nitter.poast.org')
-    nitter_urls = [url.strip() for url in nitter_urls_str.split(',')]
+    nitter_urls_str = env.get('NITTER_BASE_URLS', 'https://nitter.poast.org')
+    nitter_urls = tuple(url.strip() for url in nitter_urls_str.split(','))
     
     # Parse polling interval
     try:
-        poll_seconds = int(os.getenv('X_POLL_SECONDS', '60'))
+        poll_seconds = int(env.get('X_POLL_SECONDS', '60'))
         if poll_seconds < 10:
             raise ValueError("X_POLL_SECONDS must be at least 10 seconds")
     except ValueError as e:
@@ -38,26 +57,26 @@ def load_settings() -> Dict[str, Any]:
     
     # Parse timeout values
     try:
-        request_timeout = int(os.getenv('REQUEST_TIMEOUT', '30'))
-        max_retries = int(os.getenv('MAX_RETRIES', '3'))
-        retry_delay = int(os.getenv('RETRY_DELAY', '5'))
+        request_timeout = int(env.get('REQUEST_TIMEOUT', '30'))
+        max_retries = int(env.get('MAX_RETRIES', '3'))
+        retry_delay = int(env.get('RETRY_DELAY', '5'))
     except ValueError as e:
         raise ValueError(f"Invalid timeout configuration: {e}")
     
     # Parse boolean values
-    on_first_run_push_all = os.getenv('ON_FIRST_RUN_PUSH_ALL', 'false').lower() == 'true'
-    debug = os.getenv('DEBUG', 'false').lower() == 'true'
+    on_first_run_push_all = env.get('ON_FIRST_RUN_PUSH_ALL', 'false').lower() == 'true'
+    debug = env.get('DEBUG', 'false').lower() == 'true'
     
     # Validate timezone
-    timezone_str = os.getenv('TIMEZONE', 'Asia/Shanghai')
+    timezone_str = env.get('TIMEZONE', 'Asia/Shanghai')
     try:
         pytz.timezone(timezone_str)
     except pytz.UnknownTimeZoneError:
         raise ValueError(f"Invalid timezone: {timezone_str}")
     
     # Create directories if they don't exist
-    state_dir = os.getenv('STATE_DIR', './data/state')
-    log_dir = os.getenv('LOG_DIR', './data/logs')
+    state_dir = env.get('STATE_DIR', './data/state')
+    log_dir = env.get('LOG_DIR', './data/logs')
     
     os.makedirs(state_dir, exist_ok=True)
     os.makedirs(log_dir, exist_ok=True)
@@ -67,14 +86,14 @@ def load_settings() -> Dict[str, Any]:
             'access_token': dingtalk_token
         },
         'twitter': {
-            'username': os.getenv('X_USERNAME', 'elonmusk'),
+            'username': env.get('X_USERNAME', 'elonmusk'),
             'poll_seconds': poll_seconds
         },
         'nitter': {
             'base_urls': nitter_urls
         },
         'xtracker': {
-            'url': os.getenv('XTRACKER_URL', 'https://www.xtracker.io/api/users?stats=true&platform=X')
+            'url': env.get('XTRACKER_URL', 'https://www.xtracker.io/api/users?stats=true&platform=X')
         },
         'paths': {
             'state_dir': state_dir,
@@ -86,40 +105,79 @@ def load_settings() -> Dict[str, Any]:
         'max_retries': max_retries,
         'retry_delay': retry_delay,
         'debug': debug,
-        'log_level': os.getenv('LOG_LEVEL', 'INFO' if not debug else 'DEBUG')
+        'log_level': env.get('LOG_LEVEL', 'INFO' if not debug else 'DEBUG')
     }
     
-    return config
+    return MappingProxyType({
+        key: MappingProxyType(value) if isinstance(value, dict) else value
+        for key, value in config.items()
+    })
+
+
+class Config:
+    """
+    Attribute view of load_settings() used by the monitor service.
+    
+    Adds the service-only settings read by docker-compose: TWITTER_USERS
+    (comma-separated, defaults to X_USERNAME), CHECK_INTERVAL (minutes, defaults
+    to X_POLL_SECONDS rounded down to whole minutes) and XTRACKER_STATS_INTERVAL.
+    """
+    
+    def __init__(self, settings: Optional[Mapping[str, Any]] = None):
+        """
+        Build the service configuration.
+        
+        Args:
+            settings (Optional[Mapping[str, Any]]): Result of load_settings(), loaded when omitted
+            
+        Raises:
+            ValueError: If a setting is missing or not a valid number
+        """
+        if settings is None:
+            settings = load_settings()
+        env = os.environ
+        
+        users = env.get('TWITTER_USERS') or settings['twitter']['username']
+        self.TWITTER_USERS: List[str] = [
+            user.strip().lstrip('@') for user in users.split(',') if user.strip()
+        ]
+        if not self.TWITTER_USERS:
+            raise ValueError("TWITTER_USERS cannot be empty")
+        
+        self.NITTER_INSTANCES: List[str] = list(settings['nitter']['base_urls'])
+        self.DINGTALK_ACCESS_TOKEN: str = settings['dingtalk']['access_token']
+        # An empty XTRACKER_API_URL disables the XTracker checks
+        self.XTRACKER_API_URL: str = env.get('XTRACKER_API_URL', settings['xtracker']['url'])
+        self.STATE_DIR: str = settings['paths']['state_dir']
+        self.LOG_DIR: str = settings['paths']['log_dir']
+        self.REQUEST_TIMEOUT: int = settings['request_timeout']
+        self.MAX_RETRIES: int = settings['max_retries']
+        self.ON_FIRST_RUN_PUSH_ALL: bool = settings['on_first_run_push_all']
+        
+        try:
+            default_interval = max(1, settings['twitter']['poll_seconds'] // 60)
+            self.CHECK_INTERVAL: int = int(env.get('CHECK_INTERVAL', default_interval))
+            self.XTRACKER_STATS_INTERVAL: int = int(env.get('XTRACKER_STATS_INTERVAL', '60'))
+        except ValueError as e:
+            raise ValueError(f"Invalid check interval: {e}")
+        if self.CHECK_INTERVAL < 1 or self.XTRACKER_STATS_INTERVAL < 1:
+            raise ValueError("CHECK_INTERVAL and XTRACKER_STATS_INTERVAL must be at least 1 minute")
 
 
-def validate_config(config: Dict[str, Any]) -> bool:
+def validate_config(config: Mapping[str, Any]) -> bool:
     """
     Validate the configuration settings.
     
     Args:
-        config (Dict[str, Any]): Configuration dictionary to validate
+        config (Mapping[str, Any]): Configuration mapping to validate
         
     Returns:
         bool: True if configuration is valid
     """
-    required_keys = [
-        'dingtalk.access_token',
-        'twitter.username',
-        'twitter.poll_seconds',
-        'nitter.base_urls',
-        'xtracker.url',
-        'paths.state_dir',
-        'paths.log_dir'
-    ]
-    
-    for key in required_keys:
-        keys = key.split('.')
-        value = config
-        for k in keys:
-            if k not in value:
-                print(f"Missing configuration: {key}")
-                return False
-            value = value[k]
+    for section, key in REQUIRED_KEYS:
+        if key not in config.get(section, ()):
+            print(f"Missing configuration: {section}.{key}")
+            return False
     
     # Validate specific values
     if not config['dingtalk']['access_token']:
@@ -152,6 +210,9 @@ Required Environment Variables:
 
 Optional Environment Variables:
 - X_POLL_SECONDS: Polling interval in seconds (default: 60)
+- TWITTER_USERS: Comma-separated usernames for the service (default: X_USERNAME)
+- CHECK_INTERVAL: Service tweet check interval in minutes (default: X_POLL_SECONDS in minutes)
+- XTRACKER_STATS_INTERVAL: Service XTracker check interval in minutes (default: 60)
 - NITTER_BASE_URLS: Comma-separated Nitter mirror URLs
 - XTRACKER_URL: XTracker API endpoint URL
 - TIMEZONE: Timezone for scheduling (default: Asia/Shanghai)
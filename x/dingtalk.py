@@ -2,65 +2,485 @@
 DingTalk notification module for sending messages to DingTalk groups
 """
 
+import asyncio
+import aiohttp
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import queue
+import random
+import socket
+import threading
 import time
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional, Tuple
 from .logging_config import get_logger
+from .proxy_config import configure_requests_session, get_proxy_config
 
 
-class DingTalkClient:
-    """Client for sending messages to DingTalk via webhook"""
+DINGTALK_HOST = "oapi.dingtalk.com"
+
+# Transient failures worth retrying; anything else (bad token, keyword filter,
+# security check, ...) fails the same way on every attempt
+RETRYABLE_ERRCODES = frozenset({-1, 88, 45009, 130101})
+RETRYABLE_HTTP_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Security check failure; with "keywords not in content" it means the token was
+# accepted and only the message text was filtered by the robot's keyword rule
+SECURITY_CHECK_ERRCODE = 310000
+
+# How long a test_connection result is reused, in seconds
+TEST_RESULT_TTL = 60
+
+# Identical stats updates for a user within this many seconds are sent once
+STATS_DEDUP_TTL = 3600
+# Upper bound on users remembered for stats deduplication
+STATS_DEDUP_MAX_USERS = 1024
+
+# Queue item telling the background sender to exit
+_STOP = object()
+
+# At most this many media links are listed in a tweet notification
+MAX_MEDIA_LINKS = 3
+
+# Markdown message templates; optional sections are rendered to "" when absent
+_FOOTER = "\n\n\n---\n\n*通过 X Tweet Monitor 发送*"
+
+_TWEET_TEMPLATE = (
+    "## 🐦 新推文通知"
+    "\n\n**用户**: @{username}"
+    "\n\n**时间**: {timestamp}"
+    "\n\n**内容**: {content}"
+    "{url_block}{media_block}{stats_block}" + _FOOTER
+)
+
+_TWEET_STATS_TEMPLATE = (
+    "\n\n\n---"
+    "\n\n### 📊 XTracker 统计"
+    "\n\n**关注者**: {followers}"
+    "\n\n**关注中**: {following}"
+    "\n\n**推文数**: {tweets}"
+    "{growth_24h}"
+)
+
+_STATS_TEMPLATE = (
+    "## 📊 @{username} 每日统计"
+    "\n\n**更新时间**: {updated_at}"
+    "\n\n**关注者**: {followers}"
+    "\n\n**关注中**: {following}"
+    "\n\n**推文数**: {tweets}"
+    "{growth_24h}{growth_7d}"
+    "\n\n**个人主页**: [查看@{username}](https://twitter.com/{username})" + _FOOTER
+)
+
+
+# Indexed by growth > 0
+_GROWTH_EMOJI = ("📉", "📈")
+
+
+def _fmt_int(value: Any) -> str:
+    """Format counts with thousands separators; placeholders such as 'N/A' pass through"""
+    return f"{value:,}" if isinstance(value, int) else str(value)
+
+
+def _format_growth(label: str, growth: Optional[int]) -> str:
+    """Render an optional growth line, or "" when the metric is missing"""
+    if growth is None:
+        return ""
+    return f"\n\n**{label}**: {_GROWTH_EMOJI[growth > 0]} {_fmt_int(growth)}"
+
+
+class _DingTalkMessages:
+    """
+    Webhook state and message building shared by DingTalkClient and AsyncDingTalkClient
+    
+    The _*_payload builders return the JSON payloads that the clients' send_*
+    methods post; transport and retries are left to each client.
+    """
     
-    def __init__(self, access_token: str, timeout: int = 30, max_retries: int = 3):
+    _HEADERS = {
+        'Content-Type': 'application/json',
+        'Charset': 'utf-8'
+    }
+    
+    # Shared "no mentions" block; payloads are only serialized, never mutated
+    _EMPTY_AT = {"atMobiles": (), "isAtAll": False}
+    
+    # Minimal message used by test_connection
+    _PING_PAYLOAD = orjson.dumps({"msgtype": "text", "text": {"content": "ping"}})
+    
+    def __init__(self, access_token: str, timeout: int = 30, max_retries: int = 3,
+                 base_delay: float = 1.0, max_backoff: float = 30.0,
+                 stats_ttl: float = STATS_DEDUP_TTL):
         self.access_token = access_token
         self.timeout = timeout
         self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_backoff = max_backoff
+        self.stats_ttl = stats_ttl
         self.logger = get_logger(__name__)
         
+        # (monotonic timestamp, result) of the last test_connection call
+        self._last_test: Optional[Tuple[float, Tuple[bool, str]]] = None
+        
+        # username -> (hash of last sent stats, monotonic send time), least recently sent first
+        self._last_stats_sent: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        
         # DingTalk webhook URL
-        self.webhook_url = f"https://oapi.dingtalk.com/robot/send?access_token={access_token}"
+        self.webhook_url = f"https://{DINGTALK_HOST}/robot/send?access_token={access_token}"
     
-    def _send_request(self, payload: Dict[str, Any]) -> bool:
-        """Send HTTP request to DingTalk webhook with retry logic"""
-        headers = {
-            'Content-Type': 'application/json',
-            'Charset': 'utf-8'
+    def _backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff: uniform in [0, min(max_backoff, base_delay * 2^attempt)]"""
+        return random.uniform(0, min(self.max_backoff, self.base_delay * (2 ** attempt)))
+    
+    @staticmethod
+    def _is_retryable_status(status: int) -> bool:
+        """Only rate limiting and transient server errors are worth retrying"""
+        return status in RETRYABLE_HTTP_STATUS
+    
+    @staticmethod
+    def _decode_result(body: bytes) -> Dict[str, Any]:
+        """
+        Decode a webhook response body
+        
+        Non-JSON bodies (e.g. an HTML error page from a proxy) are mapped to a
+        retryable errcode -1 with the start of the body as errmsg, so they get logged.
+        """
+        if not body:
+            return {}
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return {'errcode': -1, 'errmsg': body[:200].decode('utf-8', 'replace')}
+    
+    def _cached_test_result(self, now: float) -> Optional[Tuple[bool, str]]:
+        """Return the last test_connection result if it is younger than TEST_RESULT_TTL"""
+        if self._last_test is not None and now - self._last_test[0] < TEST_RESULT_TTL:
+            return self._last_test[1]
+        return None
+    
+    @staticmethod
+    def _test_result(result: Dict[str, Any]) -> Tuple[bool, str]:
+        """Interpret the webhook response to a test ping"""
+        errcode = result.get('errcode')
+        if errcode == 0:
+            return True, "DingTalk connection successful"
+        if errcode == SECURITY_CHECK_ERRCODE and 'keywords' in str(result.get('errmsg', '')):
+            return True, "DingTalk connection successful (test message filtered by keyword rule)"
+        return False, f"DingTalk API error: {result}"
+    
+    def _build_at(self, at_mobiles: Optional[List[str]], is_at_all: bool) -> Dict[str, Any]:
+        """Build the "at" block, reusing the shared empty one when nobody is mentioned"""
+        if not at_mobiles and not is_at_all:
+            return self._EMPTY_AT
+        return {"atMobiles": at_mobiles or [], "isAtAll": is_at_all}
+    
+    def _text_payload(self, content: str, at_mobiles: List[str] = None, is_at_all: bool = False) -> Dict[str, Any]:
+        """Build a text message payload"""
+        return {
+            "msgtype": "text",
+            "text": {
+                "content": content
+            },
+            "at": self._build_at(at_mobiles, is_at_all)
+        }
+    
+    def _markdown_payload(self, title: str, content: str, at_mobiles: List[str] = None, is_at_all: bool = False) -> Dict[str, Any]:
+        """Build a markdown message payload"""
+        return {
+            "msgtype": "markdown",
+            "markdown": {
+                "title": title,
+                "text": content
+            },
+            "at": self._build_at(at_mobiles, is_at_all)
         }
+    
+    @staticmethod
+    def _link_payload(title: str, text: str, message_url: str, pic_url: str = None) -> Dict[str, Any]:
+        """Build a link message payload"""
+        return {
+            "msgtype": "link",
+            "link": {
+                "text": text,
+                "title": title,
+                "picUrl": pic_url or "",
+                "messageUrl": message_url
+            }
+        }
+    
+    @staticmethod
+    def _action_card_payload(title: str, text: str, btns: List[Dict[str, str]], btn_orientation: str = "0") -> Dict[str, Any]:
+        """Build an action card message payload"""
+        return {
+            "msgtype": "actionCard",
+            "actionCard": {
+                "title": title,
+                "text": text,
+                "btnOrientation": btn_orientation,
+                "btns": btns
+            }
+        }
+    
+    @staticmethod
+    def _feed_card_payload(links: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Build a feed card message payload"""
+        return {
+            "msgtype": "feedCard",
+            "feedCard": {
+                "links": links
+            }
+        }
+    
+    def _tweet_payload(self, tweet_data: Dict[str, Any], include_stats: bool = True) -> Dict[str, Any]:
+        """Render the tweet notification markdown payload"""
+        tweet = tweet_data.get('tweet', {})
+        stats = tweet_data.get('stats', {})
+        
+        tweet_url = tweet.get('url', '')
+        url_block = f"\n\n**链接**: [查看推文]({tweet_url})" if tweet_url else ""
+        
+        media_urls = tweet.get('media_urls', ())
+        media_block = ""
+        if media_urls:
+            media_block = "\n\n**媒体**:" + "".join(
+                f"\n\n  {i}. [媒体链接]({media_url})"
+                for i, media_url in enumerate(media_urls[:MAX_MEDIA_LINKS], 1)
+            )
+        
+        stats_block = ""
+        if include_stats and stats:
+            stats_block = _TWEET_STATS_TEMPLATE.format_map({
+                'followers': _fmt_int(stats.get('followers', 'N/A')),
+                'following': _fmt_int(stats.get('following', 'N/A')),
+                'tweets': _fmt_int(stats.get('tweets', 'N/A')),
+                'growth_24h': _format_growth('24小时增长', stats.get('followers_growth_24h'))
+            })
+        
+        markdown_content = _TWEET_TEMPLATE.format_map({
+            'username': tweet.get('username', 'Unknown'),
+            'timestamp': tweet.get('timestamp', 'Unknown'),
+            'content': tweet.get('content', 'No content'),
+            'url_block': url_block,
+            'media_block': media_block,
+            'stats_block': stats_block
+        })
+        
+        return self._markdown_payload(
+            title=f"@{tweet.get('username', 'Unknown')} 的新推文",
+            content=markdown_content
+        )
+    
+    def _stats_payload(self, username: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Render the stats update markdown payload"""
+        markdown_content = _STATS_TEMPLATE.format_map({
+            'username': username,
+            'updated_at': stats.get('updated_at', 'Unknown'),
+            'followers': _fmt_int(stats.get('followers', 'N/A')),
+            'following': _fmt_int(stats.get('following', 'N/A')),
+            'tweets': _fmt_int(stats.get('tweets', 'N/A')),
+            'growth_24h': _format_growth('24小时增长', stats.get('followers_growth_24h')),
+            'growth_7d': _format_growth('7天增长', stats.get('followers_growth_7d'))
+        })
+        
+        return self._markdown_payload(
+            title=f"@{username} 每日统计更新",
+            content=markdown_content
+        )
+    
+    def _is_duplicate_stats(self, username: str, stats: Dict[str, Any]) -> bool:
+        """
+        Check whether the same stats were sent for the user within stats_ttl
+        
+        Records the stats as sent when they are not a duplicate.
+        """
+        key = hash((stats.get('followers'), stats.get('following'), stats.get('tweets'),
+                    stats.get('followers_growth_24h')))
+        now = time.monotonic()
+        
+        last = self._last_stats_sent.get(username)
+        if last is not None and last[0] == key and now - last[1] < self.stats_ttl:
+            self.logger.debug("Skipping unchanged stats update for %s", username)
+            return True
+        
+        self._last_stats_sent[username] = (key, now)
+        self._last_stats_sent.move_to_end(username)
+        if len(self._last_stats_sent) > STATS_DEDUP_MAX_USERS:
+            self._last_stats_sent.popitem(last=False)
+        return False
+
+
+class DingTalkClient(_DingTalkMessages):
+    """Client for sending messages to DingTalk via webhook"""
+    
+    def __init__(self, access_token: str, timeout: int = 30, max_retries: int = 3,
+                 session: Optional[requests.Session] = None,
+                 base_delay: float = 1.0, max_backoff: float = 30.0,
+                 stats_ttl: float = STATS_DEDUP_TTL):
+        super().__init__(access_token, timeout=timeout, max_retries=max_retries,
+                         base_delay=base_delay, max_backoff=max_backoff, stats_ttl=stats_ttl)
+        self.session = session or self._create_session()
+        # Mounted on the webhook host only, so a shared session keeps its own adapters elsewhere
+        self.session.mount(f"https://{DINGTALK_HOST}/", self._create_adapter())
+        
+        # Background sender, see start_worker
+        self._queue: Optional[queue.Queue] = None
+        self._worker: Optional[threading.Thread] = None
+    
+    def _create_session(self) -> requests.Session:
+        """Create a pooled session so all messages reuse one keep-alive TLS connection"""
+        session = requests.Session()
+        configure_requests_session(session)
+        return session
+    
+    def _create_adapter(self) -> HTTPAdapter:
+        """
+        Create the adapter used for webhook requests
+        
+        urllib3 retries connection errors and RETRYABLE_HTTP_STATUS responses on
+        the pooled connection, honouring Retry-After on 429.
+        """
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=self.base_delay,
+            backoff_max=self.max_backoff,
+            status_forcelist=RETRYABLE_HTTP_STATUS,
+            allowed_methods=frozenset({'POST'}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        return HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    
+    def _send_request(self, payload: Dict[str, Any]) -> bool:
+        """
+        Send HTTP request to DingTalk webhook
+        
+        Transport errors and retryable HTTP statuses are retried by the session
+        adapter (see _create_adapter); this loop only retries RETRYABLE_ERRCODES,
+        which DingTalk reports in an HTTP 200 response.
+        """
+        data = orjson.dumps(payload)
         
         for attempt in range(self.max_retries):
+            if attempt > 0:
+                time.sleep(self._backoff_delay(attempt - 1))
+            
             try:
-                self.logger.debug(f"Sending DingTalk message (attempt {attempt + 1})")
+                self.logger.debug("Sending DingTalk message (attempt %d)", attempt + 1)
                 
-                response = requests.post(
+                response = self.session.post(
                     self.webhook_url,
-                    headers=headers,
-                    data=json.dumps(payload, ensure_ascii=False).encode('utf-8'),
+                    headers=self._HEADERS,
+                    data=data,
                     timeout=self.timeout
                 )
                 
-                response.raise_for_status()
-                result = response.json()
+                if response.status_code >= 400:
+                    self.logger.error("DingTalk rejected message with HTTP %d", response.status_code)
+                    return False
                 
-                if result.get('errcode') == 0:
+                result = self._decode_result(response.content)
+                
+                errcode = result.get('errcode')
+                if errcode == 0:
                     self.logger.info("DingTalk message sent successfully")
                     return True
-                else:
-                    self.logger.error(f"DingTalk API error: {result}")
-                    if attempt < self.max_retries - 1:
-                        time.sleep(2 ** attempt)  # Exponential backoff
+                
+                self.logger.error("DingTalk API error: %s", result)
+                if errcode not in RETRYABLE_ERRCODES:
+                    return False
                     
             except requests.exceptions.RequestException as e:
-                self.logger.error(f"HTTP error sending DingTalk message: {e}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)
+                self.logger.error("HTTP error sending DingTalk message: %s", e)
+                return False
             except Exception as e:
-                self.logger.error(f"Unexpected error sending DingTalk message: {e}")
-                if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)
+                self.logger.error("Unexpected error sending DingTalk message: %s", e)
+                return False
         
         return False
     
+    def ping(self, timeout: float = 2) -> bool:
+        """
+        Check that the DingTalk webhook host is reachable without posting a message
+        
+        Opens a plain TCP connection to the webhook host, or sends a HEAD request
+        through the session when a proxy is configured, since direct connections
+        may be blocked there.
+        
+        Args:
+            timeout (float): Connection timeout in seconds
+            
+        Returns:
+            bool: True if the webhook host answered
+        """
+        proxies = get_proxy_config()
+        try:
+            if proxies:
+                self.session.head(f"https://{DINGTALK_HOST}/", timeout=timeout, proxies=proxies)
+                return True
+            with socket.create_connection((DINGTALK_HOST, 443), timeout=timeout):
+                return True
+        except (OSError, requests.exceptions.RequestException) as e:
+            self.logger.warning("DingTalk host unreachable: %s", e)
+            return False
+    
+    def start_worker(self, queue_size: int = 256):
+        """
+        Start a background thread that sends enqueued messages in order
+        
+        Args:
+            queue_size (int): Maximum number of pending messages; enqueue_* raises queue.Full beyond it
+        """
+        if self._worker is not None:
+            return
+        
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._worker = threading.Thread(target=self._drain, name="dingtalk-sender", daemon=True)
+        self._worker.start()
+    
+    def _drain(self):
+        """Worker loop: send queued messages until the stop sentinel arrives"""
+        q = self._queue
+        while True:
+            item = q.get()
+            try:
+                if item is _STOP:
+                    return
+                
+                future, send, args = item
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(send(*args))
+                    except Exception as e:
+                        future.set_exception(e)
+            finally:
+                q.task_done()
+    
+    def _enqueue(self, send, *args) -> Future:
+        """
+        Queue a send_* call for the background worker
+        
+        Never blocks, so it is safe to call from a coroutine; raises queue.Full
+        when the worker has fallen queue_size messages behind.
+        """
+        if self._worker is None:
+            raise RuntimeError("DingTalk worker is not running, call start_worker() first")
+        
+        future = Future()
+        self._queue.put_nowait((future, send, args))
+        return future
+    
+    def close(self):
+        """Send all queued messages, then stop the background worker"""
+        if self._worker is None:
+            return
+        
+        self._queue.put(_STOP)
+        self._worker.join()
+        self._worker = None
+    
     def send_text_message(self, content: str, at_mobiles: List[str] = None, is_at_all: bool = False) -> bool:
         """
         Send text message to DingTalk
@@ -73,18 +493,7 @@ class DingTalkClient:
         Returns:
             bool: True if message sent successfully
         """
-        payload = {
-            "msgtype": "text",
-            "text": {
-                "content": content
-            },
-            "at": {
-                "atMobiles": at_mobiles or [],
-                "isAtAll": is_at_all
-            }
-        }
-        
-        return self._send_request(payload)
+        return self._send_request(self._text_payload(content, at_mobiles, is_at_all))
     
     def send_markdown_message(self, title: str, content: str, at_mobiles: List[str] = None, is_at_all: bool = False) -> bool:
         """
@@ -99,19 +508,7 @@ class DingTalkClient:
         Returns:
             bool: True if message sent successfully
         """
-        payload = {
-            "msgtype": "markdown",
-            "markdown": {
-                "title": title,
-                "text": content
-            },
-            "at": {
-                "atMobiles": at_mobiles or [],
-                "isAtAll": is_at_all
-            }
-        }
-        
-        return self._send_request(payload)
+        return self._send_request(self._markdown_payload(title, content, at_mobiles, is_at_all))
     
     def send_link_message(self, title: str, text: str, message_url: str, pic_url: str = None) -> bool:
         """
@@ -126,17 +523,7 @@ class DingTalkClient:
         Returns:
             bool: True if message sent successfully
         """
-        payload = {
-            "msgtype": "link",
-            "link": {
-                "text": text,
-                "title": title,
-                "picUrl": pic_url or "",
-                "messageUrl": message_url
-            }
-        }
-        
-        return self._send_request(payload)
+        return self._send_request(self._link_payload(title, text, message_url, pic_url))
     
     def send_action_card_message(self, title: str, text: str, btns: List[Dict[str, str]], btn_orientation: str = "0") -> bool:
         """
@@ -151,17 +538,7 @@ class DingTalkClient:
         Returns:
             bool: True if message sent successfully
         """
-        payload = {
-            "msgtype": "actionCard",
-            "actionCard": {
-                "title": title,
-                "text": text,
-                "btnOrientation": btn_orientation,
-                "btns": btns
-            }
-        }
-        
-        return self._send_request(payload)
+        return self._send_request(self._action_card_payload(title, text, btns, btn_orientation))
     
     def send_feed_card_message(self, links: List[Dict[str, str]]) -> bool:
         """
@@ -173,14 +550,7 @@ class DingTalkClient:
         Returns:
             bool: True if message sent successfully
         """
-        payload = {
-            "msgtype": "feedCard",
-            "feedCard": {
-                "links": links
-            }
-        }
-        
-        return self._send_request(payload)
+        return self._send_request(self._feed_card_payload(links))
     
     def send_tweet_notification(self, tweet_data: Dict[str, Any], include_stats: bool = True) -> bool:
         """
@@ -193,56 +563,7 @@ class DingTalkClient:
         Returns:
             bool: True if message sent successfully
         """
-        tweet = tweet_data.get('tweet', {})
-        stats = tweet_data.get('stats', {})
-        
-        # Build markdown content
-        content_parts = []
-        
-        # Header
-        content_parts.append(f"## 🐦 新推文通知")
-        content_parts.append(f"**用户**: @{tweet.get('username', 'Unknown')}")
-        content_parts.append(f"**时间**: {tweet.get('timestamp', 'Unknown')}")
-        
-        # Tweet content
-        content_parts.append(f"**内容**: {tweet.get('content', 'No content')}")
-        
-        # Tweet URL
-        tweet_url = tweet.get('url', '')
-        if tweet_url:
-            content_parts.append(f"**链接**: [查看推文]({tweet_url})")
-        
-        # Media URLs
-        media_urls = tweet.get('media_urls', [])
-        if media_urls:
-            content_parts.append("**媒体**:")
-            for i, media_url in enumerate(media_urls[:3], 1):
-                content_parts.append(f"  {i}. [媒体链接]({media_url})")
-        
-        # XTracker stats
-        if include_stats and stats:
-            content_parts.append("\n---")
-            content_parts.append("### 📊 XTracker 统计")
-            content_parts.append(f"**关注者**: {stats.get('followers', 'N/A'):,}")
-            content_parts.append(f"**关注中**: {stats.get('following', 'N/A'):,}")
-            content_parts.append(f"**推文数**: {stats.get('tweets', 'N/A'):,}")
-            
-            # Calculate growth
-            if stats.get('followers_growth_24h') is not None:
-                growth = stats['followers_growth_24h']
-                emoji = "📈" if growth > 0 else "📉"
-                content_parts.append(f"**24小时增长**: {emoji} {growth:,}")
-        
-        # Footer
-        content_parts.append("\n---")
-        content_parts.append(f"*通过 X Tweet Monitor 发送*")
-        
-        markdown_content = "\n\n".join(content_parts)
-        
-        return self.send_markdown_message(
-            title=f"@{tweet.get('username', 'Unknown')} 的新推文",
-            content=markdown_content
-        )
+        return self._send_request(self._tweet_payload(tweet_data, include_stats))
     
     def send_stats_update(self, username: str, stats: Dict[str, Any]) -> bool:
         """
@@ -253,62 +574,220 @@ class DingTalkClient:
             stats (Dict[str, Any]): Stats data from XTracker
             
         Returns:
-            bool: True if message sent successfully
+            bool: True if message sent successfully, or skipped as a duplicate
+        """
+        if self._is_duplicate_stats(username, stats):
+            return True
+        return self._send_request(self._stats_payload(username, stats))
+    
+    def enqueue_text_message(self, content: str, at_mobiles: List[str] = None, is_at_all: bool = False) -> Future:
+        """Queue send_text_message on the background worker; the future resolves to its result"""
+        return self._enqueue(self.send_text_message, content, at_mobiles, is_at_all)
+    
+    def enqueue_markdown_message(self, title: str, content: str, at_mobiles: List[str] = None, is_at_all: bool = False) -> Future:
+        """Queue send_markdown_message on the background worker; the future resolves to its result"""
+        return self._enqueue(self.send_markdown_message, title, content, at_mobiles, is_at_all)
+    
+    def enqueue_tweet_notification(self, tweet_data: Dict[str, Any], include_stats: bool = True) -> Future:
+        """Queue send_tweet_notification on the background worker; the future resolves to its result"""
+        return self._enqueue(self.send_tweet_notification, tweet_data, include_stats)
+    
+    def enqueue_stats_update(self, username: str, stats: Dict[str, Any]) -> Future:
+        """Queue send_stats_update on the background worker; the future resolves to its result"""
+        return self._enqueue(self.send_stats_update, username, stats)
+    
+    def test_connection(self) -> Tuple[bool, str]:
         """
-        content_parts = []
+        Test connection to DingTalk webhook
         
-        content_parts.append(f"## 📊 @{username} 每日统计")
-        content_parts.append(f"**更新时间**: {stats.get('updated_at', 'Unknown')}")
+        Posts a minimal "ping" message and reuses the result for TEST_RESULT_TTL
+        seconds so repeated health checks stay cheap. Errcodes are not retried;
+        transport errors and RETRYABLE_HTTP_STATUS responses are, by the session
+        adapter (see _create_adapter).
         
-        # Main stats
-        content_parts.append(f"**关注者**: {stats.get('followers', 'N/A'):,}")
-        content_parts.append(f"**关注中**: {stats.get('following', 'N/A'):,}")
-        content_parts.append(f"**推文数**: {stats.get('tweets', 'N/A'):,}")
+        Returns:
+            Tuple[bool, str]: (success, message)
+        """
+        now = time.monotonic()
+        cached = self._cached_test_result(now)
+        if cached is not None:
+            return cached
         
-        # Growth metrics
-        if stats.get('followers_growth_24h') is not None:
-            growth = stats['followers_growth_24h']
-            emoji = "📈" if growth > 0 else "📉"
-            content_parts.append(f"**24小时增长**: {emoji} {growth:,}")
+        try:
+            response = self.session.post(
+                self.webhook_url,
+                headers=self._HEADERS,
+                data=self._PING_PAYLOAD,
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            result = self._test_result(self._decode_result(response.content))
+                
+        except Exception as e:
+            result = False, f"DingTalk connection error: {str(e)}"
         
-        if stats.get('followers_growth_7d') is not None:
-            growth_7d = stats['followers_growth_7d']
-            emoji = "📈" if growth_7d > 0 else "📉"
-            content_parts.append(f"**7天增长**: {emoji} {growth_7d:,}")
+        self._last_test = (now, result)
+        return result
+
+
+class AsyncDingTalkClient(_DingTalkMessages):
+    """
+    Asyncio client for sending many DingTalk messages concurrently
+    
+    Builds the same messages as DingTalkClient; its send_* methods are coroutines
+    and there is no background worker, use send_many to send in bulk.
+    """
+    
+    def __init__(self, access_token: str, timeout: int = 30, max_retries: int = 3,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 base_delay: float = 1.0, max_backoff: float = 30.0,
+                 stats_ttl: float = STATS_DEDUP_TTL):
+        super().__init__(access_token, timeout=timeout, max_retries=max_retries,
+                         base_delay=base_delay, max_backoff=max_backoff, stats_ttl=stats_ttl)
+        # aiohttp sessions must be created inside a running event loop, see _get_session
+        self.session = session
+        self._owns_session = session is None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared aiohttp session, creating it on first use"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=10, keepalive_timeout=75)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+    
+    async def _send_request(self, payload: Dict[str, Any]) -> bool:
+        """Send HTTP request to DingTalk webhook with retry logic"""
+        session = self._get_session()
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        proxies = get_proxy_config()
+        proxy = proxies.get('https') if proxies else None
         
-        # Profile URL
-        profile_url = f"https://twitter.com/{username}"
-        content_parts.append(f"**个人主页**: [查看@{username}]({profile_url})")
+        for attempt in range(self.max_retries):
+            if attempt > 0:
+                await asyncio.sleep(self._backoff_delay(attempt - 1))
+            
+            try:
+                self.logger.debug("Sending DingTalk message (attempt %d)", attempt + 1)
+                
+                async with session.post(
+                    self.webhook_url,
+                    headers=self._HEADERS,
+                    data=orjson.dumps(payload),
+                    timeout=timeout,
+                    proxy=proxy
+                ) as response:
+                    if response.status >= 400 and not self._is_retryable_status(response.status):
+                        self.logger.error("DingTalk rejected message with HTTP %d", response.status)
+                        return False
+                    
+                    response.raise_for_status()
+                    result = self._decode_result(await response.read())
+                
+                errcode = result.get('errcode')
+                if errcode == 0:
+                    self.logger.info("DingTalk message sent successfully")
+                    return True
+                
+                self.logger.error("DingTalk API error: %s", result)
+                if errcode not in RETRYABLE_ERRCODES:
+                    return False
+                    
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.error("HTTP error sending DingTalk message: %s", e)
+            except Exception as e:
+                self.logger.error("Unexpected error sending DingTalk message: %s", e)
         
-        content_parts.append("\n---")
-        content_parts.append("*通过 X Tweet Monitor 发送*")
+        return False
+    
+    async def send_text_message(self, content: str, at_mobiles: List[str] = None, is_at_all: bool = False) -> bool:
+        """Async variant of DingTalkClient.send_text_message"""
+        return await self._send_request(self._text_payload(content, at_mobiles, is_at_all))
+    
+    async def send_markdown_message(self, title: str, content: str, at_mobiles: List[str] = None, is_at_all: bool = False) -> bool:
+        """Async variant of DingTalkClient.send_markdown_message"""
+        return await self._send_request(self._markdown_payload(title, content, at_mobiles, is_at_all))
+    
+    async def send_link_message(self, title: str, text: str, message_url: str, pic_url: str = None) -> bool:
+        """Async variant of DingTalkClient.send_link_message"""
+        return await self._send_request(self._link_payload(title, text, message_url, pic_url))
+    
+    async def send_action_card_message(self, title: str, text: str, btns: List[Dict[str, str]], btn_orientation: str = "0") -> bool:
+        """Async variant of DingTalkClient.send_action_card_message"""
+        return await self._send_request(self._action_card_payload(title, text, btns, btn_orientation))
+    
+    async def send_feed_card_message(self, links: List[Dict[str, str]]) -> bool:
+        """Async variant of DingTalkClient.send_feed_card_message"""
+        return await self._send_request(self._feed_card_payload(links))
+    
+    async def send_tweet_notification(self, tweet_data: Dict[str, Any], include_stats: bool = True) -> bool:
+        """Async variant of DingTalkClient.send_tweet_notification"""
+        return await self._send_request(self._tweet_payload(tweet_data, include_stats))
+    
+    async def send_stats_update(self, username: str, stats: Dict[str, Any]) -> bool:
+        """Async variant of DingTalkClient.send_stats_update, skipping duplicates the same way"""
+        if self._is_duplicate_stats(username, stats):
+            return True
+        return await self._send_request(self._stats_payload(username, stats))
+    
+    async def send_many(self, payloads: List[Dict[str, Any]], concurrency: int = 10) -> List[bool]:
+        """
+        Send several messages concurrently
         
-        markdown_content = "\n\n".join(content_parts)
+        Args:
+            payloads (List[Dict[str, Any]]): Message payloads in DingTalk webhook format
+            concurrency (int): Maximum number of requests in flight
+            
+        Returns:
+            List[bool]: Per-payload success flags, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency)
         
-        return self.send_markdown_message(
-            title=f"@{username} 每日统计更新",
-            content=markdown_content
-        )
+        async def send(payload: Dict[str, Any]) -> bool:
+            async with semaphore:
+                return await self._send_request(payload)
+        
+        return list(await asyncio.gather(*(send(payload) for payload in payloads)))
     
-    def test_connection(self) -> Tuple[bool, str]:
+    async def test_connection(self) -> Tuple[bool, str]:
         """
         Test connection to DingTalk webhook
         
         Returns:
             Tuple[bool, str]: (success, message)
         """
+        now = time.monotonic()
+        cached = self._cached_test_result(now)
+        if cached is not None:
+            return cached
+        
+        proxies = get_proxy_config()
         try:
-            # Send a simple test message
-            test_message = "🔧 X Tweet Monitor 连接测试"
-            success = self.send_text_message(test_message)
-            
-            if success:
-                return True, "DingTalk connection successful"
-            else:
-                return False, "Failed to send test message to DingTalk"
+            async with self._get_session().post(
+                self.webhook_url,
+                headers=self._HEADERS,
+                data=self._PING_PAYLOAD,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                proxy=proxies.get('https') if proxies else None
+            ) as response:
+                response.raise_for_status()
+                result = self._test_result(self._decode_result(await response.read()))
                 
         except Exception as e:
-            return False, f"DingTalk connection error: {str(e)}"
+            result = False, f"DingTalk connection error: {str(e)}"
+        
+        self._last_test = (now, result)
+        return result
+    
+    async def close(self):
+        """Close the aiohttp session if this client created it"""
+        if self._owns_session and self.session is not None and not self.session.closed:
+            await self.session.close()
+    
+    async def __aenter__(self) -> 'AsyncDingTalkClient':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
 
 
 def test_dingtalk():
@@ -2,17 +2,148 @@
 Logging configuration module
 """
 
+import atexit
+import functools
 import logging
 import os
+import queue
 import sys
-from datetime import datetime
-from typing import Optional
+import threading
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from typing import Dict, Optional, Tuple
 
 
+# One background listener per (log_dir, level) output configuration
+_listeners: Dict[Tuple[Optional[str], int], Tuple[QueueHandler, QueueListener]] = {}
+# Reentrant: _get_queue_handler creates the shared file handler while holding it
+_listeners_lock = threading.RLock()
+
+# One rotating file handler per log directory, shared by every listener and
+# colored logger writing there; separate handlers on the same file would each
+# roll it over at midnight and delete each other's backups
+_file_handlers: Dict[str, TimedRotatingFileHandler] = {}
+
+# Serializes handler attachment so concurrent first calls cannot double-attach
+_LOGGER_LOCK = threading.Lock()
+
+_FMT = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+
+def _parse_level(log_level: str) -> int:
+    """Map a level name such as "INFO" to its numeric value, defaulting to INFO"""
+    return logging._nameToLevel.get(log_level.upper(), logging.INFO)
+
+
+def _stop_listeners():
+    """Flush and stop all background listeners at interpreter exit"""
+    with _listeners_lock:
+        for _, listener in _listeners.values():
+            listener.stop()
+        _listeners.clear()
+
+
+atexit.register(_stop_listeners)
+
+
+def _release_log_dir(log_dir: str):
+    """
+    Stop the listeners writing to log_dir and close their handlers.
+    
+    Stopping a listener first writes out every record already queued, so the
+    log file is complete afterwards and can be read or removed.
+    
+    Args:
+        log_dir (str): Directory passed to get_logger / setup_global_logging
+    """
+    with _listeners_lock:
+        for key in [key for key in _listeners if key[0] == log_dir]:
+            _, listener = _listeners.pop(key)
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+        file_handler = _file_handlers.pop(log_dir, None)
+        if file_handler is not None:
+            file_handler.close()
+
+
+def _get_file_handler(log_dir: str) -> TimedRotatingFileHandler:
+    """
+    Get the shared handler that rolls log_dir/x_monitor.log over at midnight.
+    
+    Created on first use and opened on first write. It has no level of its own;
+    the loggers writing to it decide what gets through.
+    
+    Args:
+        log_dir (str): Directory for the log file, created if missing
+        
+    Returns:
+        TimedRotatingFileHandler: Handler shared by all loggers using log_dir
+    """
+    with _listeners_lock:
+        file_handler = _file_handlers.get(log_dir)
+        if file_handler is None:
+            os.makedirs(log_dir, exist_ok=True)
+            file_handler = TimedRotatingFileHandler(
+                os.path.join(log_dir, 'x_monitor.log'),
+                when='midnight', backupCount=14, encoding='utf-8', delay=True
+            )
+            file_handler.setFormatter(_FMT)
+            _file_handlers[log_dir] = file_handler
+        return file_handler
+
+
+def _get_queue_handler(log_dir: Optional[str], numeric_level: int) -> QueueHandler:
+    """
+    Get the queue handler for an output configuration, starting its listener once.
+    
+    Callers only enqueue records; console and file writes happen on the
+    listener thread, so logging never blocks on stdout or disk I/O.
+    
+    Args:
+        log_dir (Optional[str]): Directory for log files. If None, logs to console only.
+        numeric_level (int): Numeric logging level for the underlying handlers
+        
+    Returns:
+        QueueHandler: Handler feeding the shared listener
+    """
+    key = (log_dir, numeric_level)
+    with _listeners_lock:
+        if key in _listeners:
+            return _listeners[key][0]
+        
+        # Console handler
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(numeric_level)
+        console_handler.setFormatter(_FMT)
+        handlers = [console_handler]
+        
+        # File handler if log_dir is provided
+        if log_dir:
+            try:
+                handlers.append(_get_file_handler(log_dir))
+            except Exception as e:
+                logging.getLogger(__name__).warning(f"Could not create file handler: {e}")
+        
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        
+        queue_handler = QueueHandler(log_queue)
+        _listeners[key] = (queue_handler, listener)
+        return queue_handler
+
+
+@functools.lru_cache(maxsize=None)
 def get_logger(name: str, log_dir: Optional[str] = None, log_level: str = "INFO") -> logging.Logger:
     """
     Get a configured logger instance.
     
+    Results are cached per (name, log_dir, log_level), so repeated calls from
+    client constructors skip the setup work.
+    
     Args:
         name (str): Logger name
         log_dir (Optional[str]): Directory for log files. If None, logs to console only.
@@ -24,38 +155,18 @@ def get_logger(name: str, log_dir: Optional[str] = None, log_level: str = "INFO"
     logger = logging.getLogger(name)
     
     # Avoid duplicate handlers
-    if logger.handlers:
+    if getattr(logger, '_x_configured', False):
         return logger
     
-    # Set logging level
-    numeric_level = getattr(logging, log_level.upper(), logging.INFO)
-    logger.setLevel(numeric_level)
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(numeric_level)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler if log_dir is provided
-    if log_dir:
-        try:
-            os.makedirs(log_dir, exist_ok=True)
-            log_file = os.path.join(log_dir, f"x_monitor_{datetime.now().strftime('%Y%m%d')}.log")
-            
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(numeric_level)
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
-            
-        except Exception as e:
-            logger.warning(f"Could not create file handler: {e}")
+    with _LOGGER_LOCK:
+        if getattr(logger, '_x_configured', False):
+            return logger
+        
+        # Set logging level
+        numeric_level = _parse_level(log_level)
+        logger.setLevel(numeric_level)
+        logger.addHandler(_get_queue_handler(log_dir, numeric_level))
+        logger._x_configured = True
     
     return logger
 
@@ -69,38 +180,15 @@ def setup_global_logging(log_dir: Optional[str] = None, log_level: str = "INFO")
         log_level (str): Logging level
     """
     # Configure root logger
+    numeric_level = _parse_level(log_level)
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+    root_logger.setLevel(numeric_level)
     
     # Remove existing handlers
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, log_level.upper(), logging.INFO))
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
-    
-    # File handler
-    if log_dir:
-        try:
-            os.makedirs(log_dir, exist_ok=True)
-            log_file = os.path.join(log_dir, f"x_monitor_{datetime.now().strftime('%Y%m%d')}.log")
-            
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(getattr(logging, log_level.upper(), logging.INFO))
-            file_handler.setFormatter(formatter)
-            root_logger.addHandler(file_handler)
-            
-        except Exception as e:
-            root_logger.warning(f"Could not create file handler: {e}")
+    root_logger.addHandler(_get_queue_handler(log_dir, numeric_level))
     
     # Set third-party loggers to WARNING level to reduce noise
     logging.getLogger('urllib3').setLevel(logging.WARNING)
@@ -120,10 +208,18 @@ class ColoredFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._colored_fmt = {level: f"{color}{level}{self.RESET}" for level, color in self.COLORS.items()}
+    
     def format(self, record):
-        color = self.COLORS.get(record.levelname, '')
-        record.levelname = f"{color}{record.levelname}{self.RESET}"
-        return super().format(record)
+        # The record is shared with other handlers, so restore the plain level name afterwards
+        levelname = record.levelname
+        record.levelname = self._colored_fmt.get(levelname, levelname)
+        try:
+            return super().format(record)
+        finally:
+            record.levelname = levelname
 
 
 def get_colored_logger(name: str, log_dir: Optional[str] = None, log_level: str = "INFO") -> logging.Logger:
@@ -140,47 +236,41 @@ def get_colored_logger(name: str, log_dir: Optional[str] = None, log_level: str
     """
     logger = logging.getLogger(name)
     
-    if logger.handlers:
+    if getattr(logger, '_x_configured', False):
         return logger
     
-    numeric_level = getattr(logging, log_level.upper(), logging.INFO)
-    logger.setLevel(numeric_level)
-    
-    # Console handler with colors
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(numeric_level)
-    
-    # Use colored formatter
-    if os.name != 'nt':  # Not Windows
-        formatter = ColoredFormatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-    else:
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-    
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler (no colors for file)
-    if log_dir:
-        try:
-            os.makedirs(log_dir, exist_ok=True)
-            log_file = os.path.join(log_dir, f"x_monitor_{datetime.now().strftime('%Y%m%d')}.log")
-            
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(numeric_level)
-            file_handler.setFormatter(logging.Formatter(
+    with _LOGGER_LOCK:
+        if getattr(logger, '_x_configured', False):
+            return logger
+        
+        numeric_level = getattr(logging, log_level.upper(), logging.INFO)
+        logger.setLevel(numeric_level)
+        
+        # Console handler with colors
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(numeric_level)
+        
+        # Use colored formatter
+        if os.name != 'nt':  # Not Windows
+            formatter = ColoredFormatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
                 datefmt='%Y-%m-%d %H:%M:%S'
-            ))
-            logger.addHandler(file_handler)
-            
-        except Exception as e:
-            logger.warning(f"Could not create file handler: {e}")
+            )
+        else:
+            formatter = _FMT
+        
+        console_handler.setFormatter(formatter)
+        logger.addHandler(console_handler)
+        
+        # File handler (no colors for file), shared with get_logger for the same directory
+        if log_dir:
+            try:
+                logger.addHandler(_get_file_handler(log_dir))
+        
+            except Exception as e:
+                logger.warning(f"Could not create file handler: {e}")
+        
+        logger._x_configured = True
     
     return logger
 
@@ -210,6 +300,10 @@ def test_logging():
         file_logger.debug("This debug message should appear in log file")
         file_logger.info("This info message should appear in log file")
         
+        # Records are written on the listener thread; flush and close the file
+        # before checking it, and before the directory is removed
+        _release_log_dir(temp_dir)
+        
         # Check if log file was created
         log_files = [f for f in os.listdir(temp_dir) if f.endswith('.log')]
         if log_files:
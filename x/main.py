@@ -0,0 +1,500 @@
+"""
+X Tweet Monitor & XTracker Service
+主程序入口
+"""
+
+import os
+import enum
+import queue
+import atexit
+import shelve
+import time
+import signal
+import asyncio
+import aiohttp
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Optional
+
+from .config import Config
+from .twitter_monitor import TwitterMonitor
+from .xtracker_client import XTrackerClient, UserStats, EMPTY_USER_STATS, UNCHANGED
+from .dingtalk import DingTalkClient
+from .logging_config import get_logger
+from .proxy_config import configure_requests_session
+from .state import SeenTweetIds, state_lock, SEEN_IDS_FILE, LAST_STATS_FILE
+
+
+class HealthStatus(enum.IntEnum):
+    """健康检查中单个组件的状态"""
+    OK = 0
+    WARNING = 1
+    ERROR = 2
+    DISABLED = 3
+
+
+STARTUP_MESSAGE_TEMPLATE = """
+🚀 **X Tweet Monitor 服务已启动**
+
+- **启动时间**: {start_time}
+- **监控用户**: {users}
+- **检查间隔**: 每{check_interval}分钟
+- **Nitter实例**: {nitter_count}个
+- **XTracker API**: {xtracker_status}
+
+服务正在运行中...
+"""
+
+def create_xtracker_client(config: Config, session: Optional[requests.Session] = None) -> XTrackerClient:
+    """根据配置创建XTracker客户端"""
+    return XTrackerClient(
+        base_url=config.XTRACKER_API_URL,
+        timeout=config.REQUEST_TIMEOUT,
+        max_retries=config.MAX_RETRIES,
+        session=session
+    )
+
+
+def create_dingtalk_client(config: Config, session: Optional[requests.Session] = None) -> DingTalkClient:
+    """根据配置创建钉钉客户端"""
+    return DingTalkClient(
+        access_token=config.DINGTALK_ACCESS_TOKEN,
+        timeout=config.REQUEST_TIMEOUT,
+        session=session
+    )
+
+
+class XMonitorService:
+    """主监控服务类"""
+    
+    def __init__(self):
+        self.config = Config()
+        self.logger = get_logger(__name__)
+        
+        # 各组件共享的HTTP会话，复用TCP/TLS连接
+        self.http_session = self._create_http_session()
+        
+        # 初始化各个组件：第一个Nitter实例为主实例，其余作为备用镜像
+        nitter_instances = self.config.NITTER_INSTANCES
+        self.twitter_monitor = TwitterMonitor(
+            username=self.config.TWITTER_USERS[0],
+            nitter_instance=nitter_instances[0],
+            mirrors=nitter_instances[1:],
+            session=self.http_session,
+            max_retries=self.config.MAX_RETRIES
+        )
+        
+        self.xtracker_client = create_xtracker_client(self.config, session=self.http_session)
+        self.dingtalk_client = create_dingtalk_client(self.config, session=self.http_session)
+        
+        # 通知由后台线程发送，首次检查前才启动，见 _start_notifier
+        self._notifier_started = False
+        
+        # 状态追踪：持久化到STATE_DIR，重启或多个实例共享目录时不会重复推送
+        # 状态文件只在每轮检查时加锁打开，构造服务（如健康检查）不会占用它们
+        self.seen_tweet_ids = SeenTweetIds(os.path.join(self.config.STATE_DIR, SEEN_IDS_FILE))
+        self._last_stats_path = os.path.join(self.config.STATE_DIR, LAST_STATS_FILE)
+        
+        # 预先计算通知中不变的部分
+        self._users_csv = ', '.join(self.config.TWITTER_USERS)
+        
+        # 时间字符串缓存，见 _now_str
+        self._now_minute = None
+        self._now_prefix = ''
+    
+    def _create_http_session(self) -> requests.Session:
+        """创建带连接池的同步HTTP会话"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=self.config.MAX_RETRIES, backoff_factor=0.3)
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        configure_requests_session(session)
+        return session
+    
+    def _start_notifier(self):
+        """启动钉钉发送线程，监控循环不必等待钉钉响应；退出前发送完队列中的消息"""
+        if self._notifier_started:
+            return
+        self.dingtalk_client.start_worker()
+        atexit.register(self.dingtalk_client.close)
+        self._notifier_started = True
+    
+    def _now_str(self) -> str:
+        """当前时间字符串（%Y-%m-%d %H:%M:%S），日期与时分部分每分钟只格式化一次"""
+        now = int(time.time())
+        minute = now // 60
+        if minute != self._now_minute:
+            self._now_minute = minute
+            self._now_prefix = time.strftime('%Y-%m-%d %H:%M', time.localtime(now))
+        return f"{self._now_prefix}:{now % 60:02d}"
+    
+    def send_startup_notification(self):
+        """发送服务启动通知"""
+        message = STARTUP_MESSAGE_TEMPLATE.format_map({
+            'start_time': self._now_str(),
+            'users': self._users_csv,
+            'check_interval': self.config.CHECK_INTERVAL,
+            'nitter_count': len(self.config.NITTER_INSTANCES),
+            'xtracker_status': '启用' if self.config.XTRACKER_API_URL else '禁用'
+        })
+        
+        self.dingtalk_client.send_text_message(message)
+        self.logger.info("Startup notification sent")
+    
+    def _create_session(self) -> aiohttp.ClientSession:
+        """创建各监控任务共享的异步HTTP会话"""
+        connector = aiohttp.TCPConnector(
+            limit=64,
+            limit_per_host=8,
+            ttl_dns_cache=300,
+            keepalive_timeout=75
+        )
+        return aiohttp.ClientSession(connector=connector)
+    
+    async def _run_with_session(self, *jobs):
+        """在同一个会话中并发执行多个监控任务"""
+        self._start_notifier()
+        async with self._create_session() as session:
+            await asyncio.gather(*(job(session) for job in jobs))
+    
+    def monitor_tweets(self):
+        """监控推文"""
+        asyncio.run(self._run_with_session(self._monitor_tweets_async))
+    
+    async def _monitor_tweets_async(self, session: aiohttp.ClientSession):
+        """并发获取所有用户的推文并检查更新"""
+        self.logger.info("开始检查新推文...")
+        
+        # 每轮只发起一次批量请求，而不是每个用户一次
+        results = await self.twitter_monitor.aget_latest_tweets_batch(
+            session, self.config.TWITTER_USERS, limit=5, timeout=self.config.REQUEST_TIMEOUT
+        )
+        
+        # 循环内频繁访问的属性绑定为局部变量
+        logger = self.logger
+        seen = self.seen_tweet_ids
+        send_notification = self._send_tweet_notification
+        
+        # 加锁完成 读取→比较→保存，多个实例共享状态目录时不会重复推送
+        with seen.locked():
+            seen.load()
+            
+            for username in self.config.TWITTER_USERS:
+                try:
+                    tweets = results.get(username)
+                    if not tweets:
+                        logger.warning(f"无法获取 {username} 的推文")
+                        continue
+                    
+                    # 找出整页中尚未通知过的推文，避免漏掉短时间内连发的多条；
+                    # 仍在页面上的已通知推文（如置顶推文）刷新为最新，不会被淘汰后再次推送
+                    new_tweets = []
+                    for tweet in reversed(tweets):
+                        if (username, tweet.get('id')) in seen:
+                            seen.add(username, tweet.get('id'))
+                        else:
+                            new_tweets.append(tweet)
+                    new_tweets.reverse()
+                    if not new_tweets:
+                        logger.info(f"{username} 没有新推文")
+                        continue
+                    
+                    # 首次监控该用户时只推送最新一条，其余仅记录为已读（ON_FIRST_RUN_PUSH_ALL开启时全部推送）
+                    if not seen.has_history(username) and not self.config.ON_FIRST_RUN_PUSH_ALL:
+                        for tweet in new_tweets[1:]:
+                            seen.add(username, tweet.get('id'))
+                        new_tweets = new_tweets[:1]
+                    
+                    # 按时间顺序发送新推文通知；加入队列后才记为已通知，
+                    # 未能加入的推文（及其后更新的推文）保持未读，下一轮重试
+                    for tweet in reversed(new_tweets):
+                        if not send_notification(username, tweet):
+                            break
+                        seen.add(username, tweet.get('id'))
+                    
+                except Exception as e:
+                    logger.error(f"监控 {username} 推文时出错: {e}")
+            
+            seen.save()
+    
+    def _send_tweet_notification(self, username: str, tweet: Dict[str, Any]) -> bool:
+        """发送推文通知，返回是否已加入发送队列"""
+        try:
+            content = tweet.get('content', '')
+            
+            # 截断过长的内容
+            if len(content) > 300:
+                tweet = dict(tweet, content=f"{content[:300]}…")
+            
+            # 消息格式由DingTalkClient统一生成
+            self.dingtalk_client.enqueue_tweet_notification({'tweet': tweet})
+            self.logger.info(f"已加入 {username} 的新推文通知到发送队列")
+            return True
+            
+        except queue.Full:
+            # 在事件循环中调用，不能阻塞等待队列空出
+            self.logger.warning(f"发送队列已满，{username} 的新推文通知留待下一轮发送")
+        except Exception as e:
+            self.logger.error(f"发送推文通知时出错: {e}")
+        return False
+    
+    def monitor_xtracker_stats(self):
+        """监控XTracker统计数据"""
+        asyncio.run(self._run_with_session(self._monitor_xtracker_stats_async))
+    
+    async def _monitor_xtracker_stats_async(self, session: aiohttp.ClientSession):
+        """并发获取所有用户的XTracker统计数据并检查变化"""
+        if not self.config.XTRACKER_API_URL:
+            return
+            
+        self.logger.info("开始检查XTracker统计数据...")
+        
+        usernames = self.config.TWITTER_USERS
+        get_stats = self.xtracker_client.aget_user_stats
+        results = await asyncio.gather(
+            *(get_stats(session, username) for username in usernames),
+            return_exceptions=True
+        )
+        
+        # 循环内频繁访问的属性绑定为局部变量
+        logger = self.logger
+        send_update = self._send_stats_update
+        
+        # 每轮加锁打开，不在进程生命周期内独占数据库，其他实例可以轮流读写
+        last_stats_path = self._last_stats_path
+        with state_lock(last_stats_path), shelve.open(last_stats_path) as last_stats_by_user:
+            for username, stats in zip(usernames, results):
+                try:
+                    if isinstance(stats, Exception):
+                        raise stats
+                    
+                    # 服务器返回304，数据未变化，无需解析比较
+                    if stats is UNCHANGED:
+                        logger.info(f"{username} 的统计数据没有变化")
+                        continue
+                    
+                    if not stats:
+                        logger.warning(f"无法获取 {username} 的XTracker数据")
+                        continue
+                    
+                    # 检查是否有变化
+                    last_stats = last_stats_by_user.get(username, EMPTY_USER_STATS)
+                    current_stats = UserStats.from_stats(stats)
+                    
+                    # 如果数据有变化，发送通知
+                    # 加入发送队列后才更新记录；否则清除校验信息，下一轮重新获取、比较并发送
+                    if current_stats.followers != last_stats.followers:
+                        if send_update(username, stats):
+                            last_stats_by_user[username] = current_stats
+                        else:
+                            self.xtracker_client.forget_validators(username)
+                    else:
+                        logger.info(f"{username} 的统计数据没有变化")
+                    
+                except Exception as e:
+                    logger.error(f"监控 {username} XTracker数据时出错: {e}")
+    
+    def _send_stats_update(self, username: str, current_stats: Dict) -> bool:
+        """发送统计数据更新通知，返回是否已加入发送队列"""
+        try:
+            self.dingtalk_client.enqueue_stats_update(username, current_stats)
+            self.logger.info(f"已加入 {username} 的XTracker数据更新通知到发送队列")
+            return True
+            
+        except queue.Full:
+            self.logger.warning(f"发送队列已满，{username} 的XTracker数据更新通知留待下一轮发送")
+        except Exception as e:
+            self.logger.error(f"发送统计数据更新通知时出错: {e}")
+        return False
+    
+    def run_once(self):
+        """运行一次完整检查"""
+        self.logger.info("执行单次检查...")
+        
+        # 推文和XTracker数据访问不同的服务器，并发检查
+        asyncio.run(self._run_with_session(
+            self._monitor_tweets_async,
+            self._monitor_xtracker_stats_async
+        ))
+        
+        self.logger.info("单次检查完成")
+    
+    async def _run_periodically(self, job, session: aiohttp.ClientSession, interval_minutes: int):
+        """按固定间隔循环执行监控任务"""
+        while True:
+            await asyncio.sleep(interval_minutes * 60)
+            try:
+                await job(session)
+            except Exception as e:
+                self.logger.error(f"定时任务执行出错: {e}")
+    
+    async def _run_schedule_async(self):
+        """在同一个事件循环中运行所有定时任务，直到收到停止信号"""
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop_event.set)
+            except NotImplementedError:
+                # Windows不支持，依赖KeyboardInterrupt退出
+                pass
+        
+        async with self._create_session() as session:
+            tasks = [asyncio.create_task(
+                self._run_periodically(self._monitor_tweets_async, session, self.config.CHECK_INTERVAL)
+            )]
+            if self.config.XTRACKER_API_URL:
+                tasks.append(asyncio.create_task(self._run_periodically(
+                    self._monitor_xtracker_stats_async, session, self.config.XTRACKER_STATS_INTERVAL
+                )))
+            
+            await stop_event.wait()
+            
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def run_schedule(self):
+        """启动定时任务"""
+        self.logger.info("启动定时监控服务...")
+        
+        self._start_notifier()
+        
+        # 发送启动通知
+        self.send_startup_notification()
+        
+        self.logger.info(f"已设置定时任务:")
+        self.logger.info(f"- 推文检查: 每{self.config.CHECK_INTERVAL}分钟")
+        if self.config.XTRACKER_API_URL:
+            self.logger.info(f"- XTracker检查: 每{self.config.XTRACKER_STATS_INTERVAL}分钟")
+        
+        # 运行定时任务，进程在两次检查之间阻塞等待，不再轮询
+        try:
+            asyncio.run(self._run_schedule_async())
+        except KeyboardInterrupt:
+            pass
+        
+        self.logger.info("接收到停止信号，正在关闭服务...")
+        self.dingtalk_client.close()
+        self.dingtalk_client.send_text_message("🛑 **X Tweet Monitor 服务已停止**")
+    
+    def health_check(self):
+        """健康检查"""
+        components = {}
+        
+        # 检查Twitter监控
+        try:
+            tweet_ids = self.twitter_monitor.fetch_latest_ids(timeout=self.config.REQUEST_TIMEOUT)
+            components['twitter_monitor'] = (HealthStatus.OK if tweet_ids else HealthStatus.WARNING, None)
+        except Exception as e:
+            components['twitter_monitor'] = (HealthStatus.ERROR, e)
+        
+        # 检查XTracker
+        if self.config.XTRACKER_API_URL:
+            try:
+                success, message = self.xtracker_client.test_connection()
+                components['xtracker'] = (HealthStatus.OK, None) if success else (HealthStatus.ERROR, message)
+            except Exception as e:
+                components['xtracker'] = (HealthStatus.ERROR, e)
+        else:
+            components['xtracker'] = (HealthStatus.DISABLED, None)
+        
+        # 检查DingTalk
+        # 只探测连通性，不向群里发送消息
+        try:
+            reachable = self.dingtalk_client.ping()
+            components['dingtalk'] = (HealthStatus.OK, None) if reachable else (HealthStatus.ERROR, 'unreachable')
+        except Exception as e:
+            components['dingtalk'] = (HealthStatus.ERROR, e)
+        
+        # 设置总体状态
+        degraded = any(status is HealthStatus.ERROR for status, _ in components.values())
+        
+        return {
+            'timestamp': self._now_str(),
+            'status': 'degraded' if degraded else 'healthy',
+            'components': {
+                name: f'error: {detail}' if status is HealthStatus.ERROR else status.name.lower()
+                for name, (status, detail) in components.items()
+            }
+        }
+
+
+def install_event_loop():
+    """使用uvloop替换默认事件循环（Windows不支持uvloop，保持默认）"""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
+
+
+def _cmd_health(args):
+    """健康检查"""
+    results = XMonitorService().health_check()
+    print(orjson.dumps(results, option=orjson.OPT_INDENT_2).decode())
+
+
+def _cmd_test_dingtalk(args):
+    """测试钉钉通知"""
+    sent = create_dingtalk_client(Config()).send_text_message("🧪 **钉钉通知测试成功！**")
+    print("钉钉测试通知已发送" if sent else "钉钉测试通知发送失败")
+
+
+def _cmd_test_xtracker(args):
+    """测试XTracker API"""
+    config = Config()
+    if not config.XTRACKER_API_URL:
+        print("未配置XTRACKER_API_URL")
+        return
+    
+    stats = create_xtracker_client(config).get_user_stats(args.test_xtracker)
+    if stats:
+        print(orjson.dumps(stats, option=orjson.OPT_INDENT_2).decode())
+    else:
+        print("获取XTracker数据失败")
+
+
+def _cmd_once(args):
+    """运行一次检查"""
+    XMonitorService().run_once()
+
+
+def main():
+    """主函数"""
+    import argparse
+    
+    install_event_loop()
+    
+    parser = argparse.ArgumentParser(description='X Tweet Monitor & XTracker Service')
+    parser.add_argument('--once', action='store_true', help='运行一次检查')
+    parser.add_argument('--health', action='store_true', help='健康检查')
+    parser.add_argument('--test-dingtalk', action='store_true', help='测试钉钉通知')
+    parser.add_argument('--test-xtracker', help='测试XTracker API (提供用户名)')
+    
+    args = parser.parse_args()
+    
+    # 按子命令分发，只初始化该命令需要的组件
+    commands = {
+        'health': _cmd_health,
+        'test_dingtalk': _cmd_test_dingtalk,
+        'test_xtracker': _cmd_test_xtracker,
+        'once': _cmd_once,
+    }
+    for name, command in commands.items():
+        if getattr(args, name):
+            command(args)
+            return
+    
+    # 启动定时服务
+    XMonitorService().run_schedule()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,36 +1,51 @@
 """代理配置工具"""
+import functools
+import logging
 import os
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 
 
-def get_proxy_config() -> Optional[Dict[str, str]]:
-    """获取代理配置
-    
-    Returns:
-        代理配置字典或None（如果没有配置代理）
-    """
+_LOG = logging.getLogger(__name__)
+
+# 支持多种环境变量名格式，按优先级排列
+_HTTP_KEYS = ('HTTP_PROXY', 'http_proxy', 'PROXY_HTTP')
+_HTTPS_KEYS = ('HTTPS_PROXY', 'https_proxy', 'PROXY_HTTPS')
+
+
+@functools.lru_cache(maxsize=1)
+def _read_proxy_config() -> Tuple[Tuple[str, str], ...]:
+    """从环境变量读取代理配置，以不可变的 (协议, 地址) 元组缓存，调用方无法修改缓存内容"""
     proxies = {}
     
-    # 支持多种环境变量名格式
-    http_proxy = (
-        os.getenv('HTTP_PROXY') or 
-        os.getenv('http_proxy') or
-        os.getenv('PROXY_HTTP')
-    )
-    
-    https_proxy = (
-        os.getenv('HTTPS_PROXY') or 
-        os.getenv('https_proxy') or
-        os.getenv('PROXY_HTTPS') or
-        http_proxy  # 如果没有HTTPS代理，使用HTTP代理
-    )
+    env = os.environ
+    http_proxy = next((env[k] for k in _HTTP_KEYS if env.get(k)), None)
+    # 如果没有HTTPS代理，使用HTTP代理
+    https_proxy = next((env[k] for k in _HTTPS_KEYS if env.get(k)), None) or http_proxy
     
     if http_proxy:
         proxies['http'] = http_proxy
     if https_proxy:
         proxies['https'] = https_proxy
     
-    return proxies if proxies else None
+    return tuple(proxies.items())
+
+
+def get_proxy_config() -> Optional[Dict[str, str]]:
+    """获取代理配置
+    
+    环境变量在进程内只读取一次，修改后需调用 refresh_proxy_config()；
+    每次返回新的字典，requests等调用方修改它（如setdefault）不会影响缓存
+    
+    Returns:
+        代理配置字典或None（如果没有配置代理）
+    """
+    proxies = _read_proxy_config()
+    return dict(proxies) if proxies else None
+
+
+def refresh_proxy_config():
+    """清除代理配置缓存，下次调用 get_proxy_config() 时重新读取环境变量"""
+    _read_proxy_config.cache_clear()
 
 
 def configure_requests_session(session, proxies: Optional[Dict[str, str]] = None):
@@ -45,5 +60,4 @@ def configure_requests_session(session, proxies: Optional[Dict[str, str]] = None
     
     if proxies:
         session.proxies.update(proxies)
-        import logging
-        logging.getLogger(__name__).debug("Configured proxies: %s", proxies)
\ No newline at end of file
+        _LOG.debug("Configured proxies: %s", proxies)
\ No newline at end of file
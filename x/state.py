@@ -0,0 +1,185 @@
+"""
+State persistence module
+"""
+
+import json
+import os
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single instance only
+    fcntl = None
+
+from .logging_config import get_logger
+
+
+DEFAULT_STATE_DIR = './data/state'
+SEEN_IDS_FILE = 'seen_ids.json'
+LAST_STATS_FILE = 'last_stats'
+MAX_SEEN_IDS_PER_USER = 256
+
+
+def get_state_dir() -> str:
+    """
+    Get the directory used for state files.
+
+    Returns:
+        str: State directory from STATE_DIR, or the default location
+    """
+    return os.getenv('STATE_DIR', DEFAULT_STATE_DIR)
+
+
+def _write_atomic(path: str, content: str):
+    """Write a file via a temporary sibling so readers never see partial state"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def read_last_tweet_id(username: str, state_dir: Optional[str] = None) -> Optional[str]:
+    """
+    Read the last processed tweet ID for a user.
+
+    Args:
+        username (str): Twitter/X username
+        state_dir (Optional[str]): State directory, defaults to get_state_dir()
+
+    Returns:
+        Optional[str]: Last tweet ID or None if nothing was recorded yet
+    """
+    path = os.path.join(state_dir or get_state_dir(), f"last_tweet_{username}.txt")
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def write_last_tweet_id(username: str, tweet_id: str, state_dir: Optional[str] = None):
+    """
+    Persist the last processed tweet ID for a user.
+
+    Args:
+        username (str): Twitter/X username
+        tweet_id (str): Tweet ID to record
+        state_dir (Optional[str]): State directory, defaults to get_state_dir()
+    """
+    path = os.path.join(state_dir or get_state_dir(), f"last_tweet_{username}.txt")
+    _write_atomic(path, tweet_id)
+
+
+@contextmanager
+def state_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock for a state file.
+
+    The lock lives in a ``<path>.lock`` sibling so it also covers stores that
+    replace or reopen the file itself. Instances sharing a state directory
+    wait for each other instead of interleaving read-modify-write cycles.
+
+    Args:
+        path (str): State file to lock
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f"{path}.lock", 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class SeenTweetIds:
+    """Bounded per-user record of already notified tweet IDs, persisted as JSON"""
+
+    def __init__(self, path: str, maxlen: int = MAX_SEEN_IDS_PER_USER):
+        self.path = path
+        self.maxlen = maxlen
+        self.logger = get_logger(__name__)
+
+        # deque keeps insertion order for eviction, set gives O(1) membership
+        self._order: Dict[str, Deque[str]] = {}
+        self._members: Dict[str, Set[str]] = {}
+        self._dirty = False
+
+    def locked(self):
+        """
+        Lock the record against other processes for a load/check/save cycle.
+
+        Returns:
+            ContextManager: Exclusive lock on the backing file
+        """
+        return state_lock(self.path)
+
+    def load(self):
+        """
+        Replace the in-memory record with the IDs on disk.
+
+        Every save happens under locked(), so the file is the complete record and
+        reloading it picks up IDs written by other processes without reviving
+        ones they already evicted. Starts empty if the file is missing or corrupt.
+        """
+        self._order = {}
+        self._members = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not load seen tweet IDs from {self.path}: {e}")
+            data = {}
+
+        for username, tweet_ids in data.items():
+            for tweet_id in tweet_ids:
+                self.add(username, tweet_id)
+        self._dirty = False
+
+    def has_history(self, username: str) -> bool:
+        """Whether any tweet IDs have been recorded for the user"""
+        return bool(self._members.get(username))
+
+    def __contains__(self, key) -> bool:
+        username, tweet_id = key
+        return tweet_id in self._members.get(username, ())
+
+    def add(self, username: str, tweet_id: str):
+        """
+        Record a tweet ID, evicting the least recently added one once the user's limit is reached.
+
+        Adding an ID that is already recorded moves it to the newest end, so IDs
+        that keep showing up (e.g. a pinned tweet) are not evicted and re-notified.
+        """
+        members = self._members.setdefault(username, set())
+        order = self._order.setdefault(username, deque())
+        if tweet_id in members:
+            if order[-1] != tweet_id:
+                order.remove(tweet_id)
+                order.append(tweet_id)
+                self._dirty = True
+            return
+
+        if len(order) >= self.maxlen:
+            members.discard(order.popleft())
+        order.append(tweet_id)
+        members.add(tweet_id)
+        self._dirty = True
+
+    def save(self):
+        """Write seen IDs to disk if anything changed since the last save"""
+        if not self._dirty:
+            return
+
+        try:
+            data = {username: list(order) for username, order in self._order.items()}
+            _write_atomic(self.path, json.dumps(data, ensure_ascii=False))
+            self._dirty = False
+        except OSError as e:
+            self.logger.error(f"Could not save seen tweet IDs to {self.path}: {e}")
@@ -1,73 +1,145 @@
+import asyncio
+import heapq
 import logging
 import re
 import time
-from typing import List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
+from lxml import etree
+from lxml import html as lxml_html
+from urllib.parse import quote
 
 from .state import read_last_tweet_id, write_last_tweet_id
 from .proxy_config import get_proxy_config
 
 # 浏览器User-Agent，避免被屏蔽
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+DEFAULT_HEADERS = {"User-Agent": USER_AGENT}
+
+# 时间线结果的缓存时间（秒），短时间内重复检查时不再请求Nitter
+TIMELINE_CACHE_TTL = 30
+
+# 需要重试的临时性HTTP状态码（限流和服务器错误）
+RETRYABLE_HTTP_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# 并发请求Nitter镜像的最大线程数
+MAX_MIRROR_WORKERS = 8
+
+# 单次Nitter搜索合并的最大用户数，避免查询串过长
+BATCH_SEARCH_SIZE = 20
+
+# Nitter页面均为UTF-8编码，直接解析原始字节
+HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+# 边下载边解析时每次读取的字节数
+STREAM_CHUNK_SIZE = 65536
+
+
+def _has_class(name: str) -> str:
+    """XPath条件：class属性中包含指定类名（元素可能同时带有多个类）"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _xpath(expression: str) -> etree.XPath:
+    """预编译XPath表达式；返回普通字符串，不持有对文档树的引用"""
+    return etree.XPath(expression, smart_strings=False)
+
+
+# 推文条目及其内部元素的XPath，在模块加载时编译一次，直接由lxml在C层完成匹配
+TIMELINE_ITEMS = _xpath(f"//div[{_has_class('timeline-item')}]")
+STATUS_HREF = _xpath("(.//a[contains(@href, '/status/')])[1]/@href")
+TWEET_CONTENT = _xpath(f"string((.//div[{_has_class('tweet-content')}])[1])")
+TWEET_DATE_TITLE = _xpath(f"string(((.//span[{_has_class('tweet-date')}])[1]//a)[1]/@title)")
+MAIN_TWEET = _xpath(f"(//div[{_has_class('main-tweet')}]//div[{_has_class('timeline-item')}])[1]")
+AUTHOR_NAME = _xpath(f"string((.//a[{_has_class('username')}])[1])")
+# 转推和置顶推文：Nitter搜索结果中不会出现，时间线中跳过，保证两种来源返回同类推文
+REPOST_OR_PINNED = _xpath(f"boolean(.//div[{_has_class('retweet-header')} or {_has_class('pinned')}])")
+
+# 从推文链接中提取推文ID
+STATUS_ID_RE = re.compile(r'/status/(\d+)')
+
+# 只需要推文ID时直接在原始字节中匹配每条推文的主链接（a.tweet-link），
+# 不会匹配到引用推文等内容中的其他状态链接
+TWEET_LINK_RE = re.compile(rb'class="tweet-link" href="[^"]*/status/(\d+)')
+
 
 class TwitterMonitor:
     """Twitter/X监控器，用于监控指定用户的推文"""
     
-    def __init__(self, username: str, nitter_instance: str = "https://nitter.net"):
+    def __init__(self, username: str, nitter_instance: str = "https://nitter.net",
+                 session: Optional[requests.Session] = None, mirrors: Optional[List[str]] = None,
+                 max_retries: int = 3):
         """
         初始化Twitter监控器
         
         Args:
             username: 要监控的Twitter用户名（不包含@符号）
             nitter_instance: Nitter实例URL，默认为nitter.net
+            session: 共享的requests会话，用于复用连接；为None时自行创建
+            mirrors: 备用Nitter实例URL列表，获取推文ID时与主实例并发请求
+            max_retries: 自建会话时请求失败的最大重试次数
         """
         self.username = username
         self.nitter_instance = nitter_instance.rstrip('/')
+        self.nitter_instances = [self.nitter_instance] + [mirror.rstrip('/') for mirror in mirrors or ()]
+        self.max_retries = max_retries
+        self.session = session or self._create_session()
         self.logger = logging.getLogger(__name__)
+        
+        # 自建会话已带默认请求头；共享会话为其他组件所用，需在每个请求中附带
+        self._request_headers = DEFAULT_HEADERS if session is not None else None
+        
+        # (用户名, Nitter实例) -> (获取时间, 推文ID列表)
+        # 以元组保存，调用方拿到的是副本，修改返回值不会污染缓存
+        self._cache: Dict[Tuple[str, str], Tuple[float, Tuple[str, ...]]] = {}
+        
+        # 每个URL上次响应的缓存校验信息，用于条件请求
+        self._etags: Dict[str, str] = {}
+        self._last_modified: Dict[str, str] = {}
+    
+    def _create_session(self) -> requests.Session:
+        """
+        创建带连接池的会话，多次请求复用keep-alive连接，免去重复的TCP/TLS握手
+        
+        连接错误和临时性错误状态由urllib3按指数退避重试，并遵循Retry-After
+        """
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=1.0,
+            status_forcelist=RETRYABLE_HTTP_STATUS,
+            allowed_methods=frozenset({'GET'}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=len(self.nitter_instances), pool_maxsize=32, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
     
     def fetch_latest_ids(self, timeout: int = 30) -> List[str]:
         """
         获取最新的推文ID列表
         
+        配置了备用镜像时并发请求所有实例，采用最先返回的非空结果
+        
         Args:
             timeout: 请求超时时间（秒）
             
         Returns:
             推文ID列表，按时间倒序排列（最新的在前）
         """
-        url = f"{self.nitter_instance}/{self.username}"
-        tweet_ids = []
-        
         try:
-            # 获取代理配置
-            proxies = get_proxy_config()
-            if proxies:
-                logging.debug("Using proxies: %s", proxies)
-            
-            # 发送请求
-            response = requests.get(
-                url, 
-                headers={"User-Agent": USER_AGENT},
-                timeout=timeout,
-                proxies=proxies
-            )
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 查找推文元素
-            tweets = soup.find_all('div', class_='timeline-item')
-            
-            for tweet in tweets:
-                # 查找推文链接
-                link = tweet.find('a', href=re.compile(r'/status/'))
-                if link and link.get('href'):
-                    # 从链接中提取推文ID
-                    match = re.search(r'/status/(\d+)', link['href'])
-                    if match:
-                        tweet_ids.append(match.group(1))
+            if len(self.nitter_instances) == 1:
+                tweet_ids = self._fetch_ids_from(self.nitter_instance, timeout)
+            else:
+                tweet_ids = self._fetch_ids_from_fastest(timeout)
             
             self.logger.info(f"成功获取 {len(tweet_ids)} 条推文ID")
             return tweet_ids
@@ -79,6 +151,317 @@ class TwitterMonitor:
             self.logger.error(f"解析推文ID时出错: {e}")
             return []
     
+    def _fetch_ids_from(self, instance: str, timeout: int) -> List[str]:
+        """从单个Nitter实例获取推文ID列表，请求或解析失败时抛出异常"""
+        key = (self.username, instance)
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < TIMELINE_CACHE_TTL:
+            return list(cached[1])
+        
+        url = f"{instance}/{self.username}"
+        
+        # 获取代理配置
+        proxies = get_proxy_config()
+        if proxies:
+            logging.debug("Using proxies: %s", proxies)
+        
+        # Accept-Encoding沿用会话默认值，安装brotli/zstandard后自动包含br和zstd
+        # 有缓存结果时带上校验信息，页面未变化则服务器返回304，无需下载和解析
+        headers = self._request_headers
+        if cached is not None and (url in self._etags or url in self._last_modified):
+            headers = dict(headers or ())
+            if url in self._etags:
+                headers['If-None-Match'] = self._etags[url]
+            if url in self._last_modified:
+                headers['If-Modified-Since'] = self._last_modified[url]
+        
+        # 发送请求
+        response = self.session.get(
+            url, 
+            headers=headers,
+            timeout=timeout,
+            proxies=proxies
+        )
+        if response.status_code == 304 and cached is not None:
+            self._cache[key] = (time.monotonic(), cached[1])
+            return list(cached[1])
+        
+        response.raise_for_status()
+        
+        # 快速路径：正则直接提取推文ID，无需构建DOM
+        tweet_ids = [tweet_id.decode('ascii') for tweet_id in TWEET_LINK_RE.findall(response.content)]
+        
+        # 页面结构与预期不符时退回DOM解析
+        if not tweet_ids:
+            # 直接解析原始字节，省去一次解码
+            tree = lxml_html.fromstring(response.content, parser=HTML_PARSER)
+            
+            # 查找推文元素
+            for tweet in TIMELINE_ITEMS(tree):
+                # 查找推文链接
+                hrefs = STATUS_HREF(tweet)
+                if hrefs:
+                    # 从链接中提取推文ID
+                    match = STATUS_ID_RE.search(hrefs[0])
+                    if match:
+                        tweet_ids.append(match.group(1))
+        
+        # 去重并按数值ID倒序排列，避免置顶推文打乱顺序
+        tweet_ids = sorted(dict.fromkeys(tweet_ids), key=int, reverse=True)
+        
+        # 解析成功后才记录校验信息，否则下次304会沿用旧的缓存结果
+        if response.headers.get('ETag'):
+            self._etags[url] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            self._last_modified[url] = response.headers['Last-Modified']
+        
+        self._cache[key] = (time.monotonic(), tuple(tweet_ids))
+        return tweet_ids
+    
+    def _fetch_ids_from_fastest(self, timeout: int) -> List[str]:
+        """并发请求所有Nitter实例，返回最先得到的非空结果；所有实例都失败时抛出最后一个异常"""
+        executor = ThreadPoolExecutor(max_workers=min(MAX_MIRROR_WORKERS, len(self.nitter_instances)))
+        futures = [
+            executor.submit(self._fetch_ids_from, instance, timeout)
+            for instance in self.nitter_instances
+        ]
+        result = None
+        error = None
+        
+        try:
+            for future in as_completed(futures):
+                try:
+                    tweet_ids = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                
+                if tweet_ids:
+                    return tweet_ids
+                result = tweet_ids
+        finally:
+            # 不等待较慢的实例，尚未开始的请求直接取消
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        if result is None and error is not None:
+            raise error
+        return result or []
+    
+    def _parse_tweets(self, tree: lxml_html.HtmlElement, username: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """
+        解析Nitter时间线页面中的推文
+
+        Args:
+            tree: 已解析的时间线页面根元素
+            username: 推文所属用户名，为None时从每条推文的作者信息中解析
+            limit: 最多返回的推文数量
+
+        Returns:
+            推文字典列表，按时间倒序排列（最新的在前）
+        """
+        # 按推文ID去重，同一推文可能因转推等原因出现多次
+        tweets: Dict[str, Dict[str, Any]] = {}
+
+        for item in TIMELINE_ITEMS(tree):
+            if REPOST_OR_PINNED(item):
+                continue
+            tweet = self._parse_item(item, username)
+            if tweet is not None and tweet['id'] not in tweets:
+                tweets[tweet['id']] = tweet
+
+        # 按数值ID取最新的limit条；字符串比较在ID位数不同时会出错
+        return heapq.nlargest(limit, tweets.values(), key=lambda tweet: int(tweet['id']))
+
+    def _parse_item(self, item: lxml_html.HtmlElement, username: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        解析单个推文条目
+
+        Args:
+            item: 推文条目元素（div.timeline-item）
+            username: 推文所属用户名，为None时从作者信息中解析
+
+        Returns:
+            推文字典，条目中没有推文链接或作者信息时返回None
+        """
+        hrefs = STATUS_HREF(item)
+        if not hrefs:
+            return None
+
+        match = STATUS_ID_RE.search(hrefs[0])
+        if not match:
+            return None
+
+        tweet_id = match.group(1)
+        author = username
+        if author is None:
+            author = AUTHOR_NAME(item).strip().lstrip('@')
+            if not author:
+                return None
+
+        return {
+            'id': tweet_id,
+            'username': author,
+            'content': TWEET_CONTENT(item).strip(),
+            'timestamp': TWEET_DATE_TITLE(item),
+            'url': f"https://twitter.com/{author}/status/{tweet_id}"
+        }
+
+    async def _afetch_tree(self, session: aiohttp.ClientSession, url: str, timeout: int) -> lxml_html.HtmlElement:
+        """通过共享的aiohttp会话获取页面，边下载边增量解析，返回页面根元素"""
+        # aiohttp每个请求只接受一个代理地址
+        proxies = get_proxy_config()
+        proxy = (proxies.get('https') or proxies.get('http')) if proxies else None
+
+        # 增量解析器带有状态，每个请求单独创建
+        parser = lxml_html.HTMLParser(encoding='utf-8')
+
+        async with session.get(
+            url,
+            headers=DEFAULT_HEADERS,
+            proxy=proxy,
+            timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                parser.feed(chunk)
+
+        return parser.close()
+
+    async def aget_latest_tweets(self, session: aiohttp.ClientSession, username: Optional[str] = None,
+                                 limit: int = 5, timeout: int = 30) -> List[Dict[str, Any]]:
+        """
+        异步获取用户最新推文，供多个用户并发抓取时使用
+
+        Args:
+            session: 共享的aiohttp会话
+            username: Twitter用户名，默认为当前监控的用户
+            limit: 最多返回的推文数量
+            timeout: 请求超时时间（秒）
+
+        Returns:
+            推文字典列表，按时间倒序排列（最新的在前）
+        """
+        username = username or self.username
+        url = f"{self.nitter_instance}/{username}"
+
+        try:
+            tree = await self._afetch_tree(session, url, timeout)
+            tweets = self._parse_tweets(tree, username, limit)
+            self.logger.info(f"成功获取 {username} 的 {len(tweets)} 条推文")
+            return tweets
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.error(f"请求 {username} 的推文失败: {e}")
+            return []
+        except Exception as e:
+            self.logger.error(f"解析 {username} 的推文时出错: {e}")
+            return []
+
+    async def _asearch_tweets(self, session: aiohttp.ClientSession, usernames: List[str],
+                              timeout: int) -> Dict[str, List[Dict[str, Any]]]:
+        """用一次Nitter搜索请求获取多个用户的推文，并按用户名拆分"""
+        query = ' OR '.join(f"from:{username}" for username in usernames)
+        # 与用户时间线保持一致：排除回复和转推
+        url = f"{self.nitter_instance}/search?f=tweets&q={quote(query)}&e-replies=on&e-nativeretweets=on"
+
+        tree = await self._afetch_tree(session, url, timeout)
+
+        # Nitter显示的用户名大小写可能与配置不同
+        wanted = {username.lower(): username for username in usernames}
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for tweet in self._parse_tweets(tree, None, limit=len(usernames) * 20):
+            username = wanted.get(tweet['username'].lower())
+            if username:
+                grouped.setdefault(username, []).append(tweet)
+
+        return grouped
+
+    async def aget_latest_tweets_batch(self, session: aiohttp.ClientSession, usernames: List[str],
+                                       limit: int = 5, timeout: int = 30) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        批量获取多个用户的最新推文
+
+        先通过Nitter搜索（from:a OR from:b ...）一次取回多个用户的推文，
+        搜索结果中没有出现的用户再单独请求其时间线。两种来源都只包含用户
+        自己发布的推文，不含回复、转推和置顶推文。
+
+        Args:
+            session: 共享的aiohttp会话
+            usernames: Twitter用户名列表
+            limit: 每个用户最多返回的推文数量
+            timeout: 请求超时时间（秒）
+
+        Returns:
+            用户名到推文字典列表的映射，每个列表按时间倒序排列（最新的在前）
+        """
+        batches = [
+            usernames[i:i + BATCH_SEARCH_SIZE]
+            for i in range(0, len(usernames), BATCH_SEARCH_SIZE)
+        ]
+        results: Dict[str, List[Dict[str, Any]]] = {}
+
+        searched = await asyncio.gather(
+            *(self._asearch_tweets(session, batch, timeout) for batch in batches),
+            return_exceptions=True
+        )
+        for batch, grouped in zip(batches, searched):
+            if isinstance(grouped, Exception):
+                self.logger.warning(f"批量搜索推文失败，改为逐个获取: {grouped}")
+                continue
+            for username, tweets in grouped.items():
+                results[username] = tweets[:limit]
+
+        missing = [username for username in usernames if not results.get(username)]
+        if missing:
+            fetched = await asyncio.gather(
+                *(self.aget_latest_tweets(session, username, limit, timeout) for username in missing)
+            )
+            results.update(zip(missing, fetched))
+
+        return results
+
+    def get_tweet_by_id(self, tweet_id: str, timeout: int = 30) -> Optional[Dict[str, Any]]:
+        """
+        直接请求推文详情页获取单条推文，无需下载和扫描整个时间线
+
+        依次尝试各Nitter实例，推文不存在（404）、请求失败或页面中没有该推文时换下一个实例
+
+        Args:
+            tweet_id: 推文ID
+            timeout: 请求超时时间（秒）
+
+        Returns:
+            推文字典，所有实例都未找到时返回None
+        """
+        for instance in self.nitter_instances:
+            url = f"{instance}/{self.username}/status/{tweet_id}"
+
+            try:
+                response = self.session.get(
+                    url,
+                    headers=self._request_headers,
+                    timeout=timeout,
+                    proxies=get_proxy_config()
+                )
+                if response.status_code == 404:
+                    continue
+                response.raise_for_status()
+
+                tree = lxml_html.fromstring(response.content, parser=HTML_PARSER)
+                # 没有main-tweet时退回遍历页面中的推文条目；详情页中还有同一会话的
+                # 上级推文和回复，只返回ID一致的那条，都不匹配时换下一个实例
+                for item in MAIN_TWEET(tree) or TIMELINE_ITEMS(tree):
+                    tweet = self._parse_item(item, self.username)
+                    if tweet is not None and tweet['id'] == tweet_id:
+                        return tweet
+
+            except requests.exceptions.RequestException as e:
+                self.logger.warning(f"从 {instance} 获取推文 {tweet_id} 失败: {e}")
+            except Exception as e:
+                self.logger.warning(f"解析推文 {tweet_id} 时出错: {e}")
+
+        return None
+
     def get_new_tweets(self, since_id: Optional[str] = None) -> List[str]:
         """
         获取新的推文ID
@@ -2,57 +2,195 @@
 XTracker API client for fetching Twitter/X account statistics
 """
 
+import asyncio
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 import json
-import time
-from typing import Dict, Any, Optional, Tuple
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from .logging_config import get_logger
+from .proxy_config import configure_requests_session, get_proxy_config
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json',
+    'Accept-Language': 'en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7',
+    # Only advertise encodings urllib3 can decode here (br/zstd need brotli/zstandard)
+    'Accept-Encoding': DEFAULT_ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+}
+
+# aiohttp can't decode zstd, so it sets Accept-Encoding itself from what it supports
+AIOHTTP_HEADERS = {key: value for key, value in DEFAULT_HEADERS.items() if key != 'Accept-Encoding'}
+
+
+@dataclass(frozen=True)
+class UserStats:
+    """Immutable snapshot of the counters used to detect stats changes"""
+    __slots__ = ('followers', 'following', 'tweets')
+    
+    followers: int
+    following: int
+    tweets: int
+    
+    def __reduce__(self):
+        # Frozen slotted instances can't be restored via setattr, so pickle by value
+        return (UserStats, (self.followers, self.following, self.tweets))
+    
+    @classmethod
+    def from_stats(cls, stats: Dict[str, Any]) -> 'UserStats':
+        """Build a snapshot from a stats dict returned by get_user_stats"""
+        return cls(stats.get('followers', 0), stats.get('following', 0), stats.get('tweets', 0))
+
+
+# Transient statuses retried by the session adapter
+RETRYABLE_HTTP_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Candidate response keys per stat, in priority order; tuples are (section, key) paths
+_STAT_KEYS = {
+    'followers': ('followersCount', 'followers', ('stats', 'followers')),
+    'following': ('followingCount', 'following', ('stats', 'following')),
+    'tweets': ('tweetsCount', 'tweets', ('stats', 'tweets')),
+}
+
+
+# Snapshot used before the first successful fetch for a user
+EMPTY_USER_STATS = UserStats(0, 0, 0)
+
+# Returned by the async stats methods when the server answers 304 Not Modified
+UNCHANGED = object()
 
 
 class XTrackerClient:
     """Client for fetching Twitter/X statistics from XTracker API"""
     
-    def __init__(self, base_url: str, timeout: int = 30, max_retries: int = 3):
+    def __init__(self, base_url: str, timeout: int = 30, max_retries: int = 3,
+                 session: Optional[requests.Session] = None):
         self.base_url = base_url
         self.timeout = timeout
         self.max_retries = max_retries
+        self.session = session or self._create_session()
         self.logger = get_logger(__name__)
+        
+        # Our own session carries DEFAULT_HEADERS; a shared one needs them per request
+        self._request_headers = DEFAULT_HEADERS if session is not None else None
+        
+        # Cache validators from the last response per user, for conditional requests
+        self._etags: Dict[str, str] = {}
+        self._last_modified: Dict[str, str] = {}
+    
+    def _create_session(self) -> requests.Session:
+        """
+        Create a pooled session so repeated requests reuse keep-alive connections
+        
+        Retries with exponential backoff are handled by urllib3, honouring Retry-After.
+        """
+        session = requests.Session()
+        session.headers.update(DEFAULT_HEADERS)
+        retry = Retry(
+            total=self.max_retries,
+            backoff_factor=1.0,
+            status_forcelist=RETRYABLE_HTTP_STATUS,
+            allowed_methods=frozenset({'GET'}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        configure_requests_session(session)
+        return session
     
     def _make_request(self, username: str) -> Optional[Dict[str, Any]]:
-        """Make HTTP request to XTracker API with retry logic"""
+        """Make HTTP request to XTracker API; retries are handled by the session adapter"""
         url = f"{self.base_url}&username={username}"
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json',
-            'Accept-Language': 'en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-        }
+        try:
+            self.logger.debug(f"Fetching XTracker data for {username}")
+            
+            response = self.session.get(url, headers=self._request_headers, timeout=self.timeout)
+            response.raise_for_status()
+            
+            return self._unwrap_response(orjson.loads(response.content))
+                
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Request failed for {username}: {e}")
+            return None
+        except json.JSONDecodeError as e:
+            self.logger.error(f"JSON decode error: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"Unexpected error: {e}")
+            return None
+    
+    def forget_validators(self, username: str):
+        """
+        Drop the ETag/Last-Modified remembered for a user
+        
+        The next aget_user_stats call then gets the full stats instead of
+        UNCHANGED, e.g. when the previous result could not be acted upon.
+        
+        Args:
+            username (str): Twitter/X username
+        """
+        self._etags.pop(username, None)
+        self._last_modified.pop(username, None)
+    
+    def _conditional_headers(self, username: str) -> Dict[str, str]:
+        """Request headers including validators from the user's previous response"""
+        etag = self._etags.get(username)
+        last_modified = self._last_modified.get(username)
+        if not etag and not last_modified:
+            return AIOHTTP_HEADERS
+        
+        headers = dict(AIOHTTP_HEADERS)
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+    
+    async def _amake_request(self, session: aiohttp.ClientSession, username: str) -> Any:
+        """
+        Async variant of _make_request using a shared aiohttp session
+        
+        Sends If-None-Match / If-Modified-Since from the previous response and
+        returns UNCHANGED when the server replies 304 Not Modified. Otherwise
+        returns (data, etag, last_modified); the caller remembers the validators
+        only once the data has been parsed, see aget_user_stats.
+        """
+        url = f"{self.base_url}&username={username}"
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        proxies = get_proxy_config()
+        proxy = (proxies.get('https') or proxies.get('http')) if proxies else None
         
         for attempt in range(self.max_retries):
             try:
                 self.logger.debug(f"Fetching XTracker data for {username} (attempt {attempt + 1})")
                 
-                response = requests.get(url, headers=headers, timeout=self.timeout)
-                response.raise_for_status()
+                headers = self._conditional_headers(username)
+                async with session.get(url, headers=headers, timeout=timeout, proxy=proxy) as response:
+                    if response.status == 304:
+                        return UNCHANGED
+                    
+                    response.raise_for_status()
+                    data = orjson.loads(await response.read())
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
                 
-                data = response.json()
+                return self._unwrap_response(data), etag, last_modified
                 
-                # Handle different response formats
-                if isinstance(data, list) and len(data) > 0:
-                    return data[0]  # Take first item if it's a list
-                elif isinstance(data, dict):
-                    return data
-                else:
-                    self.logger.warning(f"Unexpected response format: {type(data)}")
-                    return None
-                    
-            except requests.exceptions.RequestException as e:
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 self.logger.warning(f"Request failed (attempt {attempt + 1}): {e}")
                 if attempt < self.max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
                 else:
                     self.logger.error(f"All retry attempts failed for {username}")
                     return None
@@ -63,6 +201,16 @@ class XTrackerClient:
                 self.logger.error(f"Unexpected error: {e}")
                 return None
     
+    def _unwrap_response(self, data: Any) -> Optional[Dict[str, Any]]:
+        """Normalize the different XTracker response formats to a single dict"""
+        if isinstance(data, list) and len(data) > 0:
+            return data[0]  # Take first item if it's a list
+        elif isinstance(data, dict):
+            return data
+        else:
+            self.logger.warning(f"Unexpected response format: {type(data)}")
+            return None
+    
     def get_user_stats(self, username: str) -> Optional[Dict[str, Any]]:
         """
         Get user statistics from XTracker
@@ -77,41 +225,84 @@ class XTrackerClient:
         if not data:
             return None
         
+        return self._parse_stats(username, data)
+    
+    def get_many_user_stats(self, usernames: List[str], max_workers: int = 16) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get statistics for several users concurrently
+        
+        Requests run in a thread pool over the client's pooled session; responses
+        are parsed serially afterwards.
+        
+        Args:
+            usernames (List[str]): Twitter/X usernames
+            max_workers (int): Maximum number of requests in flight
+            
+        Returns:
+            Dict[str, Optional[Dict[str, Any]]]: Statistics per username, None for users that failed
+        """
+        if not usernames:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(usernames))) as executor:
+            responses = list(executor.map(self._make_request, usernames))
+        
+        return {
+            username: self._parse_stats(username, data) if data else None
+            for username, data in zip(usernames, responses)
+        }
+    
+    async def aget_user_stats(self, session: aiohttp.ClientSession, username: str) -> Any:
+        """
+        Get user statistics from XTracker asynchronously
+        
+        Args:
+            session (aiohttp.ClientSession): Shared aiohttp session
+            username (str): Twitter/X username
+            
+        Returns:
+            Optional[Dict[str, Any]]: User statistics, None if failed, or
+            UNCHANGED if the data has not changed since the previous call
+        """
+        result = await self._amake_request(session, username)
+        if result is UNCHANGED:
+            return UNCHANGED
+        if not result or not result[0]:
+            return None
+        
+        data, etag, last_modified = result
+        stats = self._parse_stats(username, data)
+        
+        # Only validators of a response we could parse may turn later polls into 304s
+        if stats:
+            if etag:
+                self._etags[username] = etag
+            if last_modified:
+                self._last_modified[username] = last_modified
+        return stats
+    
+    def _parse_stats(self, username: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Parse raw XTracker response data into a stats dict"""
         try:
             # Parse the response data
             stats = {
                 'username': username,
-                'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'updated_at': datetime.now().isoformat(sep=' ', timespec='seconds'),
                 'raw_data': data  # Store raw data for debugging
             }
             
             # Extract basic stats
-            if 'followersCount' in data:
-                stats['followers'] = int(data['followersCount'])
-            elif 'followers' in data:
-                stats['followers'] = int(data['followers'])
-            elif 'stats' in data and 'followers' in data['stats']:
-                stats['followers'] = int(data['stats']['followers'])
-            else:
-                stats['followers'] = 0
-            
-            if 'followingCount' in data:
-                stats['following'] = int(data['followingCount'])
-            elif 'following' in data:
-                stats['following'] = int(data['following'])
-            elif 'stats' in data and 'following' in data['stats']:
-                stats['following'] = int(data['stats']['following'])
-            else:
-                stats['following'] = 0
-            
-            if 'tweetsCount' in data:
-                stats['tweets'] = int(data['tweetsCount'])
-            elif 'tweets' in data:
-                stats['tweets'] = int(data['tweets'])
-            elif 'stats' in data and 'tweets' in data['stats']:
-                stats['tweets'] = int(data['stats']['tweets'])
-            else:
-                stats['tweets'] = 0
+            for name, keys in _STAT_KEYS.items():
+                value = None
+                for key in keys:
+                    if isinstance(key, tuple):
+                        section = data.get(key[0])
+                        value = section.get(key[1]) if isinstance(section, dict) else None
+                    else:
+                        value = data.get(key)
+                    if value is not None:
+                        break
+                stats[name] = int(value) if value is not None else 0
             
             # Extract additional stats if available
             if 'verified' in data:
@@ -157,10 +348,13 @@ class XTrackerClient:
         if not stats:
             return None
         
+        # Reuse the fetch timestamp instead of reading the clock twice more
+        date, _, time_of_day = stats['updated_at'].partition(' ')
+        
         summary = {
             'username': username,
-            'date': datetime.now().strftime('%Y-%m-%d'),
-            'time': datetime.now().strftime('%H:%M:%S'),
+            'date': date,
+            'time': time_of_day,
             'followers': stats['followers'],
             'following': stats['following'],
             'tweets': stats['tweets'],